@@ -35,6 +35,9 @@ MAX_USER_CACHE_ENTRIES = 1000  # Maximum number of cached users before warning
 MAX_PROVIDER_CACHE_ENTRIES = (
     100  # Maximum number of cached provider services before warning
 )
+# Size bounds of the opt-in response and embedding caches when held in memory
+MAX_PROVIDER_RESPONSE_CACHE_ENTRIES = int(os.getenv("MAX_PROVIDER_RESPONSE_CACHE_ENTRIES", "1000"))
+MAX_EMBEDDING_CACHE_ENTRIES = int(os.getenv("MAX_EMBEDDING_CACHE_ENTRIES", "10000"))
 
 T = TypeVar("T")
 
@@ -42,12 +45,14 @@ T = TypeVar("T")
 class AsyncCache:
     """Async-compatible cache implementation that can be extended to work with distributed cache services"""
 
-    def __init__(self, ttl_seconds: int = 300):
-        """Initialize the cache with a default TTL"""
+    def __init__(self, ttl_seconds: int = 300, max_entries: int | None = None):
+        """Initialize the cache with a default TTL and an optional size bound"""
         # For now, we'll use a simple in-memory dict, but this can be replaced
         # with a client for external cache services like Redis or Memcached
         self.cache: dict[str, dict[str, Any]] = {}
         self.ttl = ttl_seconds
+        # Once exceeded, expired and then the oldest entries are evicted
+        self.max_entries = max_entries
         self.hits = 0
         self.misses = 0
         self.expiry = {}
@@ -68,16 +73,41 @@ class AsyncCache:
             if DEBUG_CACHE:
                 logger.debug(f"Cache MISS for key: {key}")
             self.misses += 1
+            # Drop the entry if it expired, rather than keep it until overwritten
+            if key in self.cache:
+                del self.cache[key]
+                self.expiry.pop(key, None)
             return default
 
     async def set(self, key: str, value: Any, ttl: int | None = None) -> None:
         """Add an item to the cache with an optional TTL."""
         async with self.lock:
+            # Re-insert so the entry counts as the newest for eviction
+            self.cache.pop(key, None)
             self.cache[key] = value
             self.expiry[key] = time.time() + (ttl or self.ttl or float("inf"))
+            if self.max_entries is not None and len(self.cache) > self.max_entries:
+                self._evict()
             if DEBUG_CACHE:
                 logger.debug(f"Cache SET for key: {key} with TTL: {ttl or self.ttl}")
 
+    def _evict(self) -> None:
+        """Drop expired entries, then the oldest ones, to get back under max_entries.
+
+        Evicts down to 90% of the bound, so a full cache isn't rescanned on every set.
+        """
+        now = time.time()
+        for key in [key for key, expires in self.expiry.items() if expires <= now]:
+            del self.cache[key]
+            del self.expiry[key]
+        target = self.max_entries - self.max_entries // 10
+        while len(self.cache) > target:
+            key = next(iter(self.cache))
+            del self.cache[key]
+            self.expiry.pop(key, None)
+        if DEBUG_CACHE:
+            logger.debug(f"Cache: Evicted entries down to {len(self.cache)}")
+
     async def delete(self, key: str) -> None:
         """Delete a value from the cache asynchronously"""
         async with self.lock:
@@ -85,6 +115,7 @@ class AsyncCache:
                 if DEBUG_CACHE:
                     logger.debug(f"Cache: Deleting key: {key[:8]}...")
                 del self.cache[key]
+                self.expiry.pop(key, None)
 
     async def clear(self) -> None:
         """Clear all values from the cache asynchronously"""
@@ -92,6 +123,7 @@ class AsyncCache:
             logger.debug("Cache: Clearing all entries")
         async with self.lock:
             self.cache.clear()
+            self.expiry.clear()
 
     async def stats(self) -> dict[str, Any]:
         """Get cache statistics asynchronously"""
@@ -159,6 +191,14 @@ async_provider_service_cache: "AsyncCache" = _AsyncBackend(
 )  # 1-hour TTL
 # OAuth2 token caching (no TTL - uses token's own expiration with smart cleanup)
 async_oauth_token_cache: "AsyncCache" = _AsyncBackend(ttl_seconds=None)
+# Provider responses to deterministic requests (opt-in per adapter)
+async_provider_response_cache: "AsyncCache" = _AsyncBackend(
+    ttl_seconds=300, max_entries=MAX_PROVIDER_RESPONSE_CACHE_ENTRIES
+)
+# Embeddings of individual inputs (opt-in per adapter)
+async_embedding_cache: "AsyncCache" = _AsyncBackend(
+    ttl_seconds=7 * 24 * 3600, max_entries=MAX_EMBEDDING_CACHE_ENTRIES
+)
 
 
 # User-specific functions
@@ -339,6 +379,45 @@ async def invalidate_provider_service_cache_async(user_id: int) -> None:
         )
 
 
+# Provider response caching functions
+async def get_cached_provider_response_async(cache_key: str) -> dict[str, Any] | None:
+    """Get a cached provider response by its request key asynchronously"""
+    if not cache_key:
+        return None
+    return await async_provider_response_cache.get(f"response:{cache_key}")
+
+
+async def cache_provider_response_async(
+    cache_key: str, response: dict[str, Any], ttl: int | None = None
+) -> None:
+    """Cache a provider response by its request key asynchronously"""
+    if not cache_key or response is None:
+        return
+    await async_provider_response_cache.set(f"response:{cache_key}", response, ttl=ttl)
+
+
+# Per-input embedding caching functions
+async def get_cached_embeddings_async(cache_keys: list[str]) -> list[Any | None]:
+    """Get cached embeddings for several inputs at once, None for each miss"""
+    return list(
+        await asyncio.gather(
+            *(async_embedding_cache.get(f"embedding:{key}") for key in cache_keys)
+        )
+    )
+
+
+async def cache_embeddings_async(
+    embeddings: dict[str, Any], ttl: int | None = None
+) -> None:
+    """Cache embeddings by their input keys asynchronously"""
+    await asyncio.gather(
+        *(
+            async_embedding_cache.set(f"embedding:{key}", embedding, ttl=ttl)
+            for key, embedding in embeddings.items()
+        )
+    )
+
+
 # OAuth2 token caching functions
 async def get_cached_oauth_token_async(api_key: str) -> dict[str, Any] | None:
     """Get a cached OAuth2 token by API key asynchronously"""
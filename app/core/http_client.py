@@ -0,0 +1,67 @@
+"""
+Process-wide aiohttp client session shared by the provider adapters.
+
+One connector keeps keep-alive connections to the provider hosts warm across
+adapters instead of each adapter pooling its own.
+"""
+
+import asyncio
+import os
+from typing import Any, ClassVar
+
+import aiohttp
+import orjson
+
+# Connection pool limits across all providers and per provider host
+HTTP_POOL_LIMIT = int(os.getenv("HTTP_POOL_LIMIT", "512"))
+HTTP_POOL_LIMIT_PER_HOST = int(os.getenv("HTTP_POOL_LIMIT_PER_HOST", "64"))
+# Seconds to cache resolved provider addresses for
+HTTP_DNS_CACHE_TTL = int(os.getenv("HTTP_DNS_CACHE_TTL", "300"))
+# Seconds an idle keep-alive connection stays in the pool; reaping idle
+# sockets early avoids reusing ones load balancers have silently dropped
+HTTP_KEEPALIVE_TIMEOUT = float(os.getenv("HTTP_KEEPALIVE_TIMEOUT", "30"))
+# Seconds to let SSL transports shut down after the session is closed
+HTTP_CLOSE_DRAIN_SECONDS = 0.25
+
+class _SharedSession:
+    """The shared client session and the event loop it is bound to"""
+
+    session: ClassVar[aiohttp.ClientSession | None] = None
+    loop: ClassVar[asyncio.AbstractEventLoop | None] = None
+
+
+def _json_dumps(obj: Any) -> str:
+    """Serialise request bodies with orjson"""
+    return orjson.dumps(obj).decode()
+
+
+async def get_http_session() -> aiohttp.ClientSession:
+    """Return the shared client session, creating it on first use"""
+    shared = _SharedSession
+    loop = asyncio.get_running_loop()
+    if shared.session is None or shared.session.closed or shared.loop is not loop:
+        shared.session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(
+                limit=HTTP_POOL_LIMIT,
+                limit_per_host=HTTP_POOL_LIMIT_PER_HOST,
+                use_dns_cache=True,
+                ttl_dns_cache=HTTP_DNS_CACHE_TTL,
+                keepalive_timeout=HTTP_KEEPALIVE_TIMEOUT,
+            ),
+            # No total timeout: streamed completions may legitimately run long
+            timeout=aiohttp.ClientTimeout(total=None, sock_connect=10, sock_read=300),
+            json_serialize=_json_dumps,
+        )
+        shared.loop = loop
+    return shared.session
+
+
+async def close_http_session() -> None:
+    """Close the shared client session, e.g. on application shutdown"""
+    shared = _SharedSession
+    if shared.session is not None and not shared.session.closed:
+        await shared.session.close()
+        # Let SSL transports finish their shutdown before the loop stops
+        await asyncio.sleep(HTTP_CLOSE_DRAIN_SECONDS)
+    shared.session = None
+    shared.loop = None
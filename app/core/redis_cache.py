@@ -181,7 +181,9 @@ class RedisCache(_BaseFallbackMixin):
 class AsyncRedisCache(_BaseFallbackMixin):
     """Async-compatible Redis cache matching the AsyncCache public API."""
 
-    def __init__(self, ttl_seconds: int = 300):
+    def __init__(self, ttl_seconds: int = 300, max_entries: int | None = None):
+        # max_entries is accepted for AsyncCache compatibility; Redis applies
+        # its own memory policy and expires keys by TTL
         if aioredis is None:
             raise RuntimeError("redis.asyncio is required for AsyncRedisCache")
         super().__init__()
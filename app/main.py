@@ -1,6 +1,7 @@
 import os
 import time
-from collections.abc import Callable
+from collections.abc import AsyncIterator, Callable
+from contextlib import asynccontextmanager
 
 from dotenv import load_dotenv
 from fastapi import APIRouter, FastAPI, Request, HTTPException
@@ -24,8 +25,10 @@ from app.api.routes import (
     admin,
 )
 from app.core.database import engine
+from app.core.http_client import close_http_session
 from app.core.logger import get_logger
 from app.models.base import Base
+from app.services.providers.usage_tracker_service import UsageTrackerService
 from app.exceptions.exceptions import ProviderAuthenticationException, InvalidProviderException, BaseInvalidProviderSetupException, \
     ProviderAPIException, BaseInvalidRequestException, BaseInvalidForgeKeyException
 
@@ -132,6 +135,17 @@ class ForgeExceptionHandler:
         )
 
 
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """Application lifespan: flush usage writes and release pooled provider connections on shutdown."""
+    yield
+    # Billing writes come first, so a failing session close can't skip them
+    try:
+        await UsageTrackerService.flush()
+    finally:
+        await close_http_session()
+
+
 def create_app() -> FastAPI:
     """Create and configure the FastAPI application."""
     app = FastAPI(
@@ -140,6 +154,7 @@ def create_app() -> FastAPI:
         version="0.1.0",
         docs_url="/docs",
         redoc_url="/redoc",
+        lifespan=lifespan,
     )
 
     # Add CORS middleware
@@ -1,12 +1,14 @@
 import hashlib
-from datetime import datetime, UTC
+import os
+import time
+from datetime import date, datetime, UTC
 from decimal import Decimal
-from typing import Dict, Optional, Any
+from typing import ClassVar, Dict, Optional, Any
 from sqlalchemy import select, and_, or_, func, text
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.logger import get_logger
-from app.core.async_cache import async_provider_service_cache
+from app.core.async_cache import async_provider_service_cache, DEBUG_CACHE
 from app.models.pricing import ModelPricing, FallbackPricing
 
 from app.utils.model_name_matcher import ModelNameMatcher, ModelMatch
@@ -27,6 +29,16 @@ class PricingService:
     EXACT_CACHE_TTL = 86400   # 1 day - active model pricing
     FALLBACK_CACHE_TTL = 43200  # 12 hours - provider fallbacks
     EMERGENCY_CACHE_TTL = 21600  # 6 hours - emergency fallback
+    # Per-process pricing in front of the shared cache. Invalidation only clears
+    # the L1 of the worker it runs in, so this bounds how long other workers may
+    # keep serving a changed price
+    L1_CACHE_TTL = int(os.getenv("PRICING_L1_CACHE_TTL", "60"))
+    L1_CACHE_MAX_SIZE = 4096
+
+    # In-process (L1) cache: (provider, model, date) -> (expiry_ts, pricing_info).
+    # Entries may be up to L1_CACHE_TTL seconds stale in workers other than the
+    # one that invalidated them
+    _pricing_l1_cache: ClassVar[dict[tuple[str, str, date], tuple[float, Dict[str, Any]]]] = {}
     
     # Emergency fallback prices (per 1K tokens)
     EMERGENCY_PRICING = {
@@ -51,7 +63,18 @@ class PricingService:
         """
         if calculation_date is None:
             calculation_date = datetime.now(UTC)
-        
+
+        # Per-unit prices only change between days, so serve them from the
+        # in-process cache without a shared cache or database round trip
+        l1_key = (provider_name, model_name, calculation_date.date())
+        l1_entry = PricingService._pricing_l1_cache.get(l1_key)
+        if l1_entry and time.time() < l1_entry[0]:
+            if DEBUG_CACHE:
+                logger.debug(f"L1 pricing cache HIT for {provider_name}/{model_name}")
+            return PricingService._calculate_costs_from_pricing(
+                l1_entry[1], prompt_tokens - cached_tokens, completion_tokens, cached_tokens
+            )
+
         # Generate cache key for this exact pricing lookup
         cache_key = PricingService._generate_pricing_cache_key(
             provider_name, model_name, calculation_date
@@ -71,7 +94,14 @@ class PricingService:
             await async_provider_service_cache.set(cache_key, pricing_info, ttl=ttl)
             
             logger.debug(f"Cached pricing for {provider_name}/{model_name} with TTL {ttl}s")
-        
+
+        # Populate L1, dropping the oldest entry when full
+        l1_cache = PricingService._pricing_l1_cache
+        if len(l1_cache) >= PricingService.L1_CACHE_MAX_SIZE and l1_key not in l1_cache:
+            del l1_cache[next(iter(l1_cache))]
+        l1_ttl = min(PricingService.L1_CACHE_TTL, PricingService._get_cache_ttl(pricing_info['source']))
+        l1_cache[l1_key] = (time.time() + l1_ttl, pricing_info)
+
         # Calculate costs using cached pricing
         input_tokens = prompt_tokens - cached_tokens
         output_tokens = completion_tokens
@@ -305,6 +335,16 @@ class PricingService:
         """
         Invalidate pricing cache entries
         """
+        # Drop matching in-process entries as well as the shared ones; other
+        # workers pick up the change once their L1 entries expire
+        l1_cache = PricingService._pricing_l1_cache
+        for key in [
+            key for key in l1_cache
+            if (provider_name is None or key[0] == provider_name)
+            and (model_name is None or key[1] == model_name)
+        ]:
+            del l1_cache[key]
+
         if provider_name and model_name:
             # Invalidate specific model
             cache_key = f"pricing:exact:{provider_name}:{model_name}"
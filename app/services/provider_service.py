@@ -1,5 +1,4 @@
 import asyncio
-import uuid
 import inspect
 import json
 import os
@@ -19,8 +18,8 @@ from app.exceptions.exceptions import (
 )
 from app.models.user import User
 from app.models.provider_key import ProviderKey
-from app.core.database import get_db_session
 from app.services.wallet_service import WalletService
+from app.utils.sse import iter_sse_data
 
 from .providers.adapter_factory import ProviderAdapterFactory
 from .providers.base import ProviderAdapter
@@ -32,29 +31,6 @@ logger = get_logger(name="provider_service")
 MODEL_PARTS_MIN_LENGTH = 2  # Minimum number of parts in a model name (e.g., "gpt-4")
 
 
-# Create a background task to update the usage tracker that won't be cancelled
-# Even if the streaming response is cancelled by client disconnect
-async def update_usage_in_background(
-    usage_tracker_id: uuid.UUID,
-    input_tokens: int,
-    output_tokens: int,
-    cached_tokens: int,
-    reasoning_tokens: int,
-):
-    # Use a fresh DB session for logging, since the original request session
-    # may have been closed by FastAPI after the response was returned.
-
-    async with get_db_session() as new_db_session:
-        await UsageTrackerService.update_usage_tracker(
-            db=new_db_session,
-            usage_tracker_id=usage_tracker_id,
-            input_tokens=input_tokens,
-            output_tokens=output_tokens,
-            cached_tokens=cached_tokens,
-            reasoning_tokens=reasoning_tokens,
-        )
-
-
 class ProviderService:
     """Service for handling provider API calls.
 
@@ -566,7 +542,10 @@ class ProviderService:
             raise InvalidForgeKeyException(error=ValueError(error_message))
 
         logger.debug(
-            f"Processing request for provider: {provider_name}, model: {actual_model}, endpoint: {endpoint}"
+            "Processing request for provider: {}, model: {}, endpoint: {}",
+            provider_name,
+            actual_model,
+            endpoint,
         )
 
         # Update the model name if mapped
@@ -596,8 +575,7 @@ class ProviderService:
             billable = result.scalar_one_or_none() or False
             if billable:
                 await WalletService.wallet_precheck(self.user_id, self.db)
-            usage_tracker_id = await UsageTrackerService.start_tracking_usage(
-                db=self.db,
+            usage_tracker_id = await UsageTrackerService.queue_start_tracking_usage(
                 user_id=self.user_id,
                 provider_key_id=provider_key_id,
                 forge_key_id=self.api_key_id,
@@ -613,6 +591,8 @@ class ProviderService:
             logger.warning(
                 "No API key ID or provider key ID found, skipping usage tracking"
             )
+        # Pricing is keyed on lowercase names; provider_name already is lowercase
+        pricing_model = actual_model.lower()
 
         if "completion" in endpoint:
             result = await adapter.process_completion(
@@ -662,10 +642,7 @@ class ProviderService:
             error_message = f"Unsupported endpoint: {endpoint}"
             logger.error(error_message)
             # Delete the usage tracker record if it exists
-            await UsageTrackerService.delete_usage_tracker_record(
-                db=self.db,
-                usage_tracker_id=usage_tracker_id,
-            )
+            await UsageTrackerService.queue_delete_usage_tracker_record(usage_tracker_id)
             raise NotImplementedError(error_message)
 
         # Track usage statistics if it's not a streaming response
@@ -691,14 +668,14 @@ class ProviderService:
                 output_tokens = max(output_tokens, total_tokens - input_tokens)
 
             if input_tokens > 0 or output_tokens > 0:
-                asyncio.create_task(
-                    update_usage_in_background(
-                        usage_tracker_id,
-                        input_tokens,
-                        output_tokens,
-                        cached_tokens,
-                        reasoning_tokens,
-                    )
+                await UsageTrackerService.queue_update_usage_tracker(
+                    usage_tracker_id,
+                    input_tokens,
+                    output_tokens,
+                    cached_tokens,
+                    reasoning_tokens,
+                    provider_name,
+                    pricing_model,
                 )
             return result
         else:
@@ -715,7 +692,7 @@ class ProviderService:
                 # Get the streaming mode from the payload
                 stream_mode = payload.get("stream", False)
                 logger.debug(
-                    f"Streaming mode: {stream_mode} for {provider_name} request"
+                    "Streaming mode: {} for {} request", stream_mode, provider_name
                 )
 
                 messages = payload.get("messages", [])
@@ -726,16 +703,17 @@ class ProviderService:
 
                         # Store the last chunk, which might contain usage information
                         if isinstance(chunk, bytes):
-                            chunk_str = (
-                                chunk.decode("utf-8", errors="ignore") if chunk else ""
-                            )
-
-                            # Check for usage information in the chunk
-                            if chunk.startswith(b"data: "):
-                                data_str = chunk_str[6:].strip()
-                            else:
-                                data_str = chunk_str.strip()
-                            if data_str and data_str != "[DONE]":
+                            # A chunk may carry several SSE events, possibly
+                            # after comment, event or id lines, so scan every
+                            # data line; chunks without any are parsed whole
+                            payloads = list(iter_sse_data(chunk)) or [chunk.strip()]
+
+                            for payload_bytes in payloads:
+                                data_str = payload_bytes.decode(
+                                    "utf-8", errors="ignore"
+                                )
+                                if not data_str or data_str == "[DONE]":
+                                    continue
                                 try:
                                     data = json.loads(data_str)
 
@@ -743,7 +721,7 @@ class ProviderService:
                                     # https://platform.openai.com/docs/api-reference/chat_streaming/streaming#chat_streaming/streaming-usage
                                     if "usage" in data and data["usage"]:
                                         logger.debug(
-                                            f"Found usage data in chunk: {data['usage']}"
+                                            "Found usage data in chunk: {}", data["usage"]
                                         )
                                         usage = data.get("usage", {})
                                         input_tokens = (
@@ -768,7 +746,9 @@ class ProviderService:
                         yield chunk
 
                     logger.debug(
-                        f"Streaming complete for {provider_name}. Chunks processed: {chunks_processed}"
+                        "Streaming complete for {}. Chunks processed: {}",
+                        provider_name,
+                        chunks_processed,
                     )
 
                 except Exception as e:
@@ -781,20 +761,27 @@ class ProviderService:
                     raise
                 finally:
                     logger.debug(
-                        f"Logging API request final details: provider={provider_name}, "
-                        f"model={actual_model}, input_tokens={input_tokens}, "
-                        f"output_tokens={output_tokens}, cached_tokens={cached_tokens}, reasoning_tokens={reasoning_tokens}"
+                        "Logging API request final details: provider={}, model={}, "
+                        "input_tokens={}, output_tokens={}, cached_tokens={}, reasoning_tokens={}",
+                        provider_name,
+                        actual_model,
+                        input_tokens,
+                        output_tokens,
+                        cached_tokens,
+                        reasoning_tokens,
                     )
 
                     if update_usage and (input_tokens > 0 or output_tokens > 0):
-                        asyncio.create_task(
-                            update_usage_in_background(
-                                usage_tracker_id,
-                                input_tokens,
-                                output_tokens,
-                                cached_tokens,
-                                reasoning_tokens,
-                            )
+                        # Queued, or shielded when the queue is full, so a client
+                        # disconnect cancelling this stream can't drop the update
+                        await UsageTrackerService.queue_update_usage_tracker(
+                            usage_tracker_id,
+                            input_tokens,
+                            output_tokens,
+                            cached_tokens,
+                            reasoning_tokens,
+                            provider_name,
+                            pricing_model,
                         )
 
             return token_counting_stream()
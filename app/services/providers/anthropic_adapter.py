@@ -5,8 +5,9 @@ from collections.abc import AsyncGenerator
 from http import HTTPStatus
 from typing import Any, Callable, Tuple
 
-import aiohttp
+import orjson
 
+from app.core.http_client import get_http_session
 from app.core.logger import get_logger
 from app.exceptions.exceptions import (
     ProviderAPIException,
@@ -223,10 +224,8 @@ class AnthropicAdapter(ProviderAdapter):
         }
         url = f"{self._base_url}/models"
 
-        async with (
-            aiohttp.ClientSession() as session,
-            session.get(url, headers=headers, params={"limit": 100}) as response,
-        ):
+        session = await get_http_session()
+        async with session.get(url, headers=headers, params={"limit": 100}) as response:
             if response.status != HTTPStatus.OK:
                 error_text = await response.text()
                 logger.error(
@@ -498,10 +497,8 @@ class AnthropicAdapter(ProviderAdapter):
                 "cached_tokens": 0,
             }
 
-            async with (
-                aiohttp.ClientSession() as session,
-                session.post(url, headers=headers, json=anthropic_payload) as response,
-            ):
+            session = await get_http_session()
+            async with session.post(url, headers=headers, json=anthropic_payload) as response:
                 if response.status != HTTPStatus.OK:
                     error_text = await response.text()
                     if error_handler:
@@ -514,35 +511,100 @@ class AnthropicAdapter(ProviderAdapter):
                             error_message=error_text,
                         )
 
-                buffer = ""
-                async for line_bytes in response.content:
-                    decoded_line = line_bytes.decode("utf-8")
-                    buffer += decoded_line
-                    while "\n\n" in buffer:
-                        event_str, buffer = buffer.split("\n\n", 1)
-                        event_type = None
-                        data_str = None
-                        for line in event_str.strip().split("\n"):
-                            if line.startswith("event:"):
-                                event_type = line[len("event:") :].strip()
-                            elif line.startswith("data:"):
-                                data_str = line[len("data:") :].strip()
-
-                        if not event_type or data_str is None:
-                            continue
-
-                        try:
-                            data = json.loads(data_str)
-                            openai_chunk = None
-                            usage_data = None
-                            finish_reason = None
-                            # --- Event Processing Logic ---
-
-                            # Capture Input Tokens from message_start
-                            if event_type == "message_start":
-                                message_data = data.get("message", {})
-                                usage_data = AnthropicAdapter.format_anthropic_usage(message_data.get("usage", {}), token_usage)
-                                if message_data:
+                # Events are "event:" and "data:" lines ended by a blank line
+                pending_event = None
+                pending_data = None
+                async for line in response.content:
+                    line = line.strip()
+                    if line:
+                        if line.startswith(b"event:"):
+                            pending_event = line[6:].strip().decode()
+                        elif line.startswith(b"data:"):
+                            pending_data = line[5:].strip()
+                        continue
+
+                    event_type, data_str = pending_event, pending_data
+                    pending_event = pending_data = None
+                    if not event_type or data_str is None:
+                        continue
+
+                    try:
+                        data = orjson.loads(data_str)
+                        openai_chunk = None
+                        usage_data = None
+                        finish_reason = None
+                        # --- Event Processing Logic ---
+
+                        # Capture Input Tokens from message_start
+                        if event_type == "message_start":
+                            message_data = data.get("message", {})
+                            usage_data = AnthropicAdapter.format_anthropic_usage(message_data.get("usage", {}), token_usage)
+                            if message_data:
+                                openai_chunk = {
+                                    "id": request_id,
+                                    "object": "chat.completion.chunk",
+                                    "created": int(time.time()),
+                                    "model": model_name,
+                                    "choices": [
+                                        {
+                                            "index": 0,
+                                            "delta": {
+                                                "role": message_data.get("role", "assistant"),
+                                                "content": AnthropicAdapter.translate_anthropic_content_to_openai(message_data.get("content", []))[0],
+                                            },
+                                            "finish_reason": None,
+                                        }
+                                    ],
+                                }
+
+                        elif event_type == "content_block_start":
+                            # Handle start of content blocks (text or tool_use)
+                            content_block = data.get("content_block", {})
+
+                            usage_data = AnthropicAdapter.format_anthropic_usage(data.get("usage", {}), token_usage)
+                            if content_block.get("type") == "tool_use":
+                                # Start of a tool call
+                                openai_chunk = {
+                                    "id": request_id,
+                                    "object": "chat.completion.chunk",
+                                    "created": int(time.time()),
+                                    "model": model_name,
+                                    "choices": [
+                                        {
+                                            "index": 0,
+                                            "delta": {
+                                                "tool_calls": [
+                                                    {
+                                                        "index": data.get(
+                                                            "index", 0
+                                                        ),
+                                                        "id": content_block.get(
+                                                            "id",
+                                                            f"call_{uuid.uuid4().hex[:8]}",
+                                                        ),
+                                                        "type": "function",
+                                                        "function": {
+                                                            "name": content_block.get(
+                                                                "name", ""
+                                                            ),
+                                                            "arguments": "",
+                                                        },
+                                                    }
+                                                ]
+                                            },
+                                            "finish_reason": None,
+                                        }
+                                    ],
+                                }
+
+                        elif event_type == "content_block_delta":
+                            delta = data.get("delta", {})
+
+                            usage_data = AnthropicAdapter.format_anthropic_usage(data.get("usage", {}), token_usage)
+                            if delta.get("type") == "text_delta":
+                                # Text content delta
+                                delta_content = delta.get("text", "")
+                                if delta_content:
                                     openai_chunk = {
                                         "id": request_id,
                                         "object": "chat.completion.chunk",
@@ -551,22 +613,15 @@ class AnthropicAdapter(ProviderAdapter):
                                         "choices": [
                                             {
                                                 "index": 0,
-                                                "delta": {
-                                                    "role": message_data.get("role", "assistant"),
-                                                    "content": AnthropicAdapter.translate_anthropic_content_to_openai(message_data.get("content", []))[0],
-                                                },
+                                                "delta": {"content": delta_content},
                                                 "finish_reason": None,
                                             }
                                         ],
                                     }
-
-                            elif event_type == "content_block_start":
-                                # Handle start of content blocks (text or tool_use)
-                                content_block = data.get("content_block", {})
-
-                                usage_data = AnthropicAdapter.format_anthropic_usage(data.get("usage", {}), token_usage)
-                                if content_block.get("type") == "tool_use":
-                                    # Start of a tool call
+                            elif delta.get("type") == "input_json_delta":
+                                # Tool arguments delta
+                                partial_json = delta.get("partial_json", "")
+                                if partial_json:
                                     openai_chunk = {
                                         "id": request_id,
                                         "object": "chat.completion.chunk",
@@ -581,16 +636,8 @@ class AnthropicAdapter(ProviderAdapter):
                                                             "index": data.get(
                                                                 "index", 0
                                                             ),
-                                                            "id": content_block.get(
-                                                                "id",
-                                                                f"call_{uuid.uuid4().hex[:8]}",
-                                                            ),
-                                                            "type": "function",
                                                             "function": {
-                                                                "name": content_block.get(
-                                                                    "name", ""
-                                                                ),
-                                                                "arguments": "",
+                                                                "arguments": partial_json
                                                             },
                                                         }
                                                     ]
@@ -600,128 +647,78 @@ class AnthropicAdapter(ProviderAdapter):
                                         ],
                                     }
 
-                            elif event_type == "content_block_delta":
-                                delta = data.get("delta", {})
-
-                                usage_data = AnthropicAdapter.format_anthropic_usage(data.get("usage", {}), token_usage)
-                                if delta.get("type") == "text_delta":
-                                    # Text content delta
-                                    delta_content = delta.get("text", "")
-                                    if delta_content:
-                                        openai_chunk = {
-                                            "id": request_id,
-                                            "object": "chat.completion.chunk",
-                                            "created": int(time.time()),
-                                            "model": model_name,
-                                            "choices": [
-                                                {
-                                                    "index": 0,
-                                                    "delta": {"content": delta_content},
-                                                    "finish_reason": None,
-                                                }
-                                            ],
-                                        }
-                                elif delta.get("type") == "input_json_delta":
-                                    # Tool arguments delta
-                                    partial_json = delta.get("partial_json", "")
-                                    if partial_json:
-                                        openai_chunk = {
-                                            "id": request_id,
-                                            "object": "chat.completion.chunk",
-                                            "created": int(time.time()),
-                                            "model": model_name,
-                                            "choices": [
-                                                {
-                                                    "index": 0,
-                                                    "delta": {
-                                                        "tool_calls": [
-                                                            {
-                                                                "index": data.get(
-                                                                    "index", 0
-                                                                ),
-                                                                "function": {
-                                                                    "arguments": partial_json
-                                                                },
-                                                            }
-                                                        ]
-                                                    },
-                                                    "finish_reason": None,
-                                                }
-                                            ],
-                                        }
-
-                            # Capture Output Tokens & Finish Reason from message_delta
-                            elif event_type == "message_delta":
-                                delta_data = data.get("delta", {})
-
-                                usage_data = AnthropicAdapter.format_anthropic_usage(data.get("usage", {}), token_usage)
-
-                                anthropic_stop_reason = delta_data.get("stop_reason")
-                                if anthropic_stop_reason:
-                                    # Map Anthropic stop reason to OpenAI finish reason
-                                    finish_reason_map = {
-                                        "end_turn": "stop",
-                                        "stop_sequence": "stop",
-                                        "max_tokens": "length",
-                                        "tool_use": "tool_calls",
-                                    }
-                                    finish_reason = finish_reason_map.get(
-                                        anthropic_stop_reason, "stop"
-                                    )
-
-                            # Capture Finish Reason from message_stop (backup for usage)
-                            elif event_type == "message_stop":
-                                # Map Anthropic stop reason to OpenAI finish reason if not already set
-                                if not finish_reason:
-                                    anthropic_stop_reason = data.get(
-                                        "stop_reason", "end_turn"
-                                    )
-                                    finish_reason_map = {
-                                        "end_turn": "stop",
-                                        "stop_sequence": "stop",
-                                        "max_tokens": "length",
-                                        "tool_use": "tool_calls",
-                                    }
-                                    finish_reason = finish_reason_map.get(
-                                        anthropic_stop_reason, "stop"
-                                    )
+                        # Capture Output Tokens & Finish Reason from message_delta
+                        elif event_type == "message_delta":
+                            delta_data = data.get("delta", {})
 
-                                usage_data = AnthropicAdapter.format_anthropic_usage(data.get("usage", {}), token_usage)
+                            usage_data = AnthropicAdapter.format_anthropic_usage(data.get("usage", {}), token_usage)
 
-                            # --- Yielding Logic ---
-                            if openai_chunk:
-                                if finish_reason:
-                                    openai_chunk["choices"][0]["finish_reason"] = (
-                                        finish_reason
-                                    )
-
-                                if usage_data:
-                                    openai_chunk["usage"] = usage_data
-
-                                yield f"data: {json.dumps(openai_chunk)}\n\n".encode()
-                            elif usage_data:
-                                # yield the usage chunk
-                                openai_chunk = {
-                                    "id": request_id,
-                                    "object": "chat.completion.chunk",
-                                    "created": int(time.time()),
-                                    "model": model_name,
-                                    "choices": [{"index": 0, "delta": {}}],
-                                    "usage": usage_data,
+                            anthropic_stop_reason = delta_data.get("stop_reason")
+                            if anthropic_stop_reason:
+                                # Map Anthropic stop reason to OpenAI finish reason
+                                finish_reason_map = {
+                                    "end_turn": "stop",
+                                    "stop_sequence": "stop",
+                                    "max_tokens": "length",
+                                    "tool_use": "tool_calls",
                                 }
-                                if finish_reason:
-                                    openai_chunk["choices"][0]["finish_reason"] = (
-                                        finish_reason
-                                    )
-                                yield f"data: {json.dumps(openai_chunk)}\n\n".encode()
-
-                        except json.JSONDecodeError as e:
-                            logger.warning(
-                                f"Stream API error for Anthropic Base: Failed to parse JSON: {e}"
-                            )
-                            continue
-                        except Exception as e:
-                            continue
+                                finish_reason = finish_reason_map.get(
+                                    anthropic_stop_reason, "stop"
+                                )
+
+                        # Capture Finish Reason from message_stop (backup for usage)
+                        elif event_type == "message_stop":
+                            # Map Anthropic stop reason to OpenAI finish reason if not already set
+                            if not finish_reason:
+                                anthropic_stop_reason = data.get(
+                                    "stop_reason", "end_turn"
+                                )
+                                finish_reason_map = {
+                                    "end_turn": "stop",
+                                    "stop_sequence": "stop",
+                                    "max_tokens": "length",
+                                    "tool_use": "tool_calls",
+                                }
+                                finish_reason = finish_reason_map.get(
+                                    anthropic_stop_reason, "stop"
+                                )
+
+                            usage_data = AnthropicAdapter.format_anthropic_usage(data.get("usage", {}), token_usage)
+
+                        # --- Yielding Logic ---
+                        if openai_chunk:
+                            if finish_reason:
+                                openai_chunk["choices"][0]["finish_reason"] = (
+                                    finish_reason
+                                )
+
+                            if usage_data:
+                                openai_chunk["usage"] = usage_data
+
+                            yield b"data: " + orjson.dumps(openai_chunk) + b"\n\n"
+                        elif usage_data:
+                            # yield the usage chunk
+                            openai_chunk = {
+                                "id": request_id,
+                                "object": "chat.completion.chunk",
+                                "created": int(time.time()),
+                                "model": model_name,
+                                "choices": [{"index": 0, "delta": {}}],
+                                "usage": usage_data,
+                            }
+                            if finish_reason:
+                                openai_chunk["choices"][0]["finish_reason"] = (
+                                    finish_reason
+                                )
+                            yield b"data: " + orjson.dumps(openai_chunk) + b"\n\n"
+
+                    except orjson.JSONDecodeError as e:
+                        logger.warning(
+                            f"Stream API error for Anthropic Base: Failed to parse JSON: {e}"
+                        )
+                        continue
+                    except Exception as e:
+                        continue
 
             # Final SSE message
             yield b"data: [DONE]\n\n"
@@ -737,11 +734,8 @@ class AnthropicAdapter(ProviderAdapter):
         error_handler: Callable[[str, int], Any] | None = None,
     ):
         """Handle regular (non-streaming) response from Anthropic API"""
-        # Single with statement for multiple contexts
-        async with (
-            aiohttp.ClientSession() as session,
-            session.post(url, headers=headers, json=anthropic_payload) as response,
-        ):
+        session = await get_http_session()
+        async with session.post(url, headers=headers, json=anthropic_payload) as response:
             if response.status != HTTPStatus.OK:
                 error_text = await response.text()
                 logger.error(f"Completion API error for {error_text}")
@@ -751,7 +745,7 @@ class AnthropicAdapter(ProviderAdapter):
                     error_message=error_text,
                 )
 
-            anthropic_response = await response.json()
+            anthropic_response = await response.json(loads=orjson.loads)
 
             # Convert Anthropic response to OpenAI format
             completion_id = f"chatcmpl-{str(uuid.uuid4())}"
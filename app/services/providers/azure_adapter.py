@@ -68,27 +68,28 @@ class AzureAdapter(OpenAIAdapter):
     def process_streaming_chunk(chunk: bytes):
         """
         For some reason, Azure API returns a chunk which includes an empty choices array.
-        We need to add a default choice to the chunk.
+        We need to add a default choice to the chunk. A chunk may hold several events.
         """
-        chunk_str = chunk.decode("utf-8")
-        if chunk_str.startswith("data:"):
-            chunk_str = chunk_str[len("data:"):]
-        else:
-            return chunk
-        chunk_str = chunk_str.strip()
-        if chunk_str:
+        lines = chunk.split(b"\n")
+        changed = False
+        for i, line in enumerate(lines):
+            if not line.startswith(b"data:"):
+                continue
+            data = line[len(b"data:"):].strip()
+            if not data or data == b"[DONE]":
+                continue
             try:
-                chunk_json = json.loads(chunk_str)
-                if not chunk_json.get("choices"):
-                    chunk_json["choices"] =  [{
-                        "index": 0,
-                        "delta": {},
-                    }]
-                    return f'data: {json.dumps(chunk_json)}\n\n'.encode("utf-8")
-                return chunk
+                chunk_json = json.loads(data)
             except json.JSONDecodeError:
-                return chunk
-        return chunk
+                continue
+            if isinstance(chunk_json, dict) and not chunk_json.get("choices"):
+                chunk_json["choices"] = [{
+                    "index": 0,
+                    "delta": {},
+                }]
+                lines[i] = f"data: {json.dumps(chunk_json)}".encode("utf-8")
+                changed = True
+        return b"\n".join(lines) if changed else chunk
 
     async def process_completion(
         self,
@@ -1,5 +1,7 @@
+import hashlib
 import time
 from abc import ABC, abstractmethod
+from collections import OrderedDict
 from typing import Any, ClassVar
 
 # Constants for API key masking
@@ -15,10 +17,12 @@ MIN_KEY_LENGTH_FOR_FULL_MASK_LOGIC = (
 class ProviderAdapter(ABC):
     """Base class for all provider adapters"""
 
-    # Class-level cache for models across all adapter instances
-    _models_cache: ClassVar[dict[str, list[str]]] = {}
-    _models_cache_expiry: ClassVar[dict[str, float]] = {}
+    # Class-level LRU cache of (expiry, models) across all adapter instances
+    _models_cache: ClassVar[OrderedDict[str, tuple[float, list[str]]]] = OrderedDict()
     _models_cache_ttl: ClassVar[int] = 3600  # 1 hour
+    _models_cache_max_size: ClassVar[int] = 128
+    # Serve expired models when the provider fails to list them
+    _models_cache_fallback: ClassVar[bool] = True
 
     @property
     @abstractmethod
@@ -68,18 +72,28 @@ class ProviderAdapter(ABC):
         """Process a embeddings request"""
         pass
 
+    def _models_cache_key(self, api_key: str, base_url: str | None) -> str:
+        """Cache key for a models list, hashing the API key so it isn't kept in memory"""
+        key_hash = hashlib.sha256(api_key.encode()).hexdigest()[:16]
+        return f"{self.provider_name}:{key_hash}:{base_url or 'default'}"
+
     def get_cached_models(self, api_key: str, base_url: str | None) -> list[str] | None:
         """Get cached models if available and not expired"""
-        cache_key = f"{self.provider_name}:{api_key}:{base_url or 'default'}"
-        current_time = time.time()
+        cache_key = self._models_cache_key(api_key, base_url)
+        entry = self._models_cache.get(cache_key)
 
         # Check if we have this key in cache and it's not expired
-        if (
-            cache_key in self._models_cache
-            and self._models_cache_expiry.get(cache_key, 0) > current_time
-        ):
-            return self._models_cache[cache_key]
+        if entry is not None and entry[0] > time.time():
+            self._models_cache.move_to_end(cache_key)
+            return entry[1]
         return None
+
+    def get_stale_models(self, api_key: str, base_url: str | None) -> list[str] | None:
+        """Get cached models even if expired, for use when the provider is failing"""
+        if not self._models_cache_fallback:
+            return None
+        entry = self._models_cache.get(self._models_cache_key(api_key, base_url))
+        return entry[1] if entry is not None else None
     
     @staticmethod
     def serialize_api_key_config(api_key: str, config: dict[str, Any] | None) -> str:
@@ -131,11 +145,13 @@ class ProviderAdapter(ABC):
         self, api_key: str, base_url: str | None, models: list[str]
     ) -> None:
         """Cache models for this adapter"""
-        cache_key = f"{self.provider_name}:{api_key}:{base_url or 'default'}"
+        cache_key = self._models_cache_key(api_key, base_url)
 
-        # Store the models in cache with expiry
-        self._models_cache[cache_key] = models
-        self._models_cache_expiry[cache_key] = time.time() + self._models_cache_ttl
+        # Store the models in cache with expiry, evicting the least recently used
+        self._models_cache[cache_key] = (time.time() + self._models_cache_ttl, models)
+        self._models_cache.move_to_end(cache_key)
+        while len(self._models_cache) > self._models_cache_max_size:
+            self._models_cache.popitem(last=False)
 
     @abstractmethod
     async def list_models(self, api_key: str, base_url: str | None = None) -> list[str]:
@@ -1,4 +1,8 @@
+import asyncio
+import contextlib
 import json
+import os
+import random
 import time
 import uuid
 from collections.abc import AsyncGenerator
@@ -6,7 +10,9 @@ from http import HTTPStatus
 from typing import Any
 
 import aiohttp
+import orjson
 
+from app.core.http_client import get_http_session
 from app.core.logger import get_logger
 from app.exceptions.exceptions import ProviderAPIException, BaseForgeException
 
@@ -15,6 +21,13 @@ from .base import ProviderAdapter
 # Configure logging
 logger = get_logger(name="cohere_adapter")
 
+# Maximum number of texts Cohere accepts in a single embed request
+MAX_EMBED_BATCH_SIZE = 96
+# Maximum number of embedding batches of one request sent at once
+MAX_CONCURRENT_EMBEDDING_BATCHES = int(os.getenv("EMBED_MAX_CONCURRENCY", "8"))
+# Retries of an embedding batch after a rate limit, server error or network error
+EMBED_MAX_RETRIES = int(os.getenv("EMBED_MAX_RETRIES", "3"))
+
 
 class CohereAdapter(ProviderAdapter):
     def __init__(self, provider_name: str, base_url: str | None = None, config: dict[str, str] | None = None):
@@ -40,25 +53,25 @@ class CohereAdapter(ProviderAdapter):
             "page_size": 1000,
         }
 
-        async with aiohttp.ClientSession() as session:
-            async with session.get(
-                base_url, headers=headers, params=params
-            ) as response:
-                if response.status != HTTPStatus.OK:
-                    error_text = await response.text()
-                    logger.error(f"List models API error for {self.provider_name}: {error_text}")
-                    raise ProviderAPIException(
-                        provider_name=self.provider_name,
-                        error_code=response.status,
-                        error_message=error_text
-                    )
-                resp = await response.json()
-                models = [d["name"] for d in resp["models"]]
-
-                # Cache the results
-                self.cache_models(api_key, base_url, models)
-
-                return models
+        session = await get_http_session()
+        async with session.get(
+            base_url, headers=headers, params=params
+        ) as response:
+            if response.status != HTTPStatus.OK:
+                error_text = await response.text()
+                logger.error(f"List models API error for {self.provider_name}: {error_text}")
+                raise ProviderAPIException(
+                    provider_name=self.provider_name,
+                    error_code=response.status,
+                    error_message=error_text
+                )
+            resp = await response.json()
+            models = [d["name"] for d in resp["models"]]
+
+            # Cache the results
+            self.cache_models(api_key, base_url, models)
+
+            return models
 
     @staticmethod
     def convert_usage_data(usage_data: dict[str, Any]) -> dict[str, Any]:
@@ -136,10 +149,8 @@ class CohereAdapter(ProviderAdapter):
                 "Content-Type": "application/json",
             }
 
-            async with (
-                aiohttp.ClientSession() as session,
-                session.post(url, json=payload, headers=headers) as response,
-            ):
+            session = await get_http_session()
+            async with session.post(url, json=payload, headers=headers) as response:
                 if response.status != HTTPStatus.OK:
                     error_text = await response.text()
                     logger.error(f"Streaming completion API error for {self.provider_name}: {error_text}")
@@ -152,151 +163,156 @@ class CohereAdapter(ProviderAdapter):
                 # Track the message ID for consistency
                 message_id = None
                 created = int(time.time())
-                async for chunk in response.content.iter_chunks():
-                    if not chunk[0]:  # Skip empty chunks
+                # Bytes of a partially received event are carried over to the
+                # next read; an incomplete event left at EOF is discarded, as
+                # the SSE spec requires
+                buffer = bytearray()
+                async for chunk, _ in response.content.iter_chunks():
+                    if not chunk:  # Skip empty chunks
                         continue
-
-                    try:
-                        # Parse SSE format
-                        chunk_text = chunk[0].decode("utf-8")
-                        if not chunk_text.strip():
-                            continue
-
-                        # Split into individual SSE events (separated by double newlines)
-                        events = chunk_text.strip().split("\n\n")
-                        for event_text in events:
-                            if not event_text.strip():
-                                continue
-
-                            # Skip [DONE] event
-                            if event_text.strip() == "data: [DONE]":
-                                continue
-
-                            # Split into lines and process SSE format
-                            lines = event_text.split("\n")
-                            # event_type = None
-                            data = None
-
-                            for line in lines:
-                                # if line.startswith("event: "):
-                                # event_type = line[7:].strip()
-                                if line.startswith("data: "):
-                                    data = line[6:].strip()
-
-                            if not data:
-                                continue
-
-                            cohere_chunk = json.loads(data)
-                            chunk_type = cohere_chunk.get("type")
-
-                            # Initialize message ID on first chunk
-                            if message_id is None:
-                                message_id = cohere_chunk.get(
-                                    "id", f"chatcmpl-{uuid.uuid4()}"
-                                )
-
-                            openai_chunk = None
-                            usage_data = None
-                            # Convert to OpenAI format based on chunk type
-                            if chunk_type == "message-start":
-                                openai_chunk = {
-                                    "id": message_id,
-                                    "object": "chat.completion.chunk",
-                                    "created": created,
-                                    "model": model,
-                                    "choices": [
-                                        {
-                                            "index": 0,
-                                            "delta": {
-                                                "role": "assistant",
-                                                "content": "",
-                                            },
-                                            "finish_reason": None,
-                                        }
-                                    ],
-                                }
-
-                            elif chunk_type == "content-delta":
-                                content = (
-                                    cohere_chunk.get("delta", {})
-                                    .get("message", {})
-                                    .get("content", {})
-                                    .get("text", "")
-                                )
-                                openai_chunk = {
-                                    "id": message_id,
-                                    "object": "chat.completion.chunk",
-                                    "created": created,
-                                    "model": model,
-                                    "choices": [
-                                        {
-                                            "index": 0,
-                                            "delta": {"content": content},
-                                            "finish_reason": None,
-                                        }
-                                    ],
-                                }
-
-                            elif chunk_type in ["content-end", "content-start"]:
-                                # For content-end/content-start, we send an empty content delta
-                                openai_chunk = {
-                                    "id": message_id,
-                                    "object": "chat.completion.chunk",
-                                    "created": created,
-                                    "model": model,
-                                    "choices": [
-                                        {
-                                            "index": 0,
-                                            "delta": {"content": ""},
-                                            "finish_reason": None,
-                                        }
-                                    ],
-                                }
-
-                            elif chunk_type == "message-end":
-                                finish_reason = cohere_chunk.get("delta", {}).get(
-                                    "finish_reason", "stop"
-                                )
-
-                                openai_chunk = {
-                                    "id": message_id,
-                                    "object": "chat.completion.chunk",
-                                    "created": created,
-                                    "model": model,
-                                    "choices": [
-                                        {
-                                            "index": 0,
-                                            "delta": {},
-                                            "finish_reason": finish_reason,
-                                        }
-                                    ],
-                                }
+                    buffer += chunk
+
+                    # Collect every converted event of this network read and
+                    # flush them in a single yield to cut per-yield overhead
+                    out = bytearray()
+                    start = 0
+                    with memoryview(buffer) as view:
+                        # Index into the receive buffer instead of decoding it
+                        # and splitting it into per-event and per-line strings
+                        while (end := buffer.find(b"\n\n", start)) != -1:
+                            event_start, start = start, end + 2
+                            try:
+                                # Cohere sends a single data line per event; if
+                                # there are several, the last one wins
+                                data_start = buffer.rfind(b"\ndata: ", event_start, end)
+                                if data_start != -1:
+                                    data_start += 7
+                                elif buffer.startswith(b"data: ", event_start):
+                                    data_start = event_start + 6
+                                else:
+                                    continue
+                                data_end = buffer.find(b"\n", data_start, end)
+                                if data_end == -1:
+                                    data_end = end
+
+                                # Skip empty and [DONE] events
+                                if data_end == data_start or view[data_start:data_end] == b"[DONE]":
+                                    continue
+
+                                cohere_chunk = orjson.loads(view[data_start:data_end])
+                                chunk_type = cohere_chunk.get("type")
+
+                                # Initialize message ID on first chunk
+                                if message_id is None:
+                                    message_id = cohere_chunk.get(
+                                        "id", f"chatcmpl-{uuid.uuid4()}"
+                                    )
+
+                                openai_chunk = None
+                                usage_data = None
+                                # Convert to OpenAI format based on chunk type
+                                if chunk_type == "message-start":
+                                    openai_chunk = {
+                                        "id": message_id,
+                                        "object": "chat.completion.chunk",
+                                        "created": created,
+                                        "model": model,
+                                        "choices": [
+                                            {
+                                                "index": 0,
+                                                "delta": {
+                                                    "role": "assistant",
+                                                    "content": "",
+                                                },
+                                                "finish_reason": None,
+                                            }
+                                        ],
+                                    }
+
+                                elif chunk_type == "content-delta":
+                                    content = (
+                                        cohere_chunk.get("delta", {})
+                                        .get("message", {})
+                                        .get("content", {})
+                                        .get("text", "")
+                                    )
+                                    openai_chunk = {
+                                        "id": message_id,
+                                        "object": "chat.completion.chunk",
+                                        "created": created,
+                                        "model": model,
+                                        "choices": [
+                                            {
+                                                "index": 0,
+                                                "delta": {"content": content},
+                                                "finish_reason": None,
+                                            }
+                                        ],
+                                    }
+
+                                elif chunk_type in ["content-end", "content-start"]:
+                                    # For content-end/content-start, we send an empty content delta
+                                    openai_chunk = {
+                                        "id": message_id,
+                                        "object": "chat.completion.chunk",
+                                        "created": created,
+                                        "model": model,
+                                        "choices": [
+                                            {
+                                                "index": 0,
+                                                "delta": {"content": ""},
+                                                "finish_reason": None,
+                                            }
+                                        ],
+                                    }
+
+                                elif chunk_type == "message-end":
+                                    finish_reason = cohere_chunk.get("delta", {}).get(
+                                        "finish_reason", "stop"
+                                    )
+
+                                    openai_chunk = {
+                                        "id": message_id,
+                                        "object": "chat.completion.chunk",
+                                        "created": created,
+                                        "model": model,
+                                        "choices": [
+                                            {
+                                                "index": 0,
+                                                "delta": {},
+                                                "finish_reason": finish_reason,
+                                            }
+                                        ],
+                                    }
                             
-                            if 'usage' in cohere_chunk:
-                                usage_data = self.convert_usage_data(cohere_chunk['usage'])
-
-                            if openai_chunk:
-                                if usage_data:
-                                    openai_chunk["usage"] = usage_data
-                                yield f"data: {json.dumps(openai_chunk)}\n\n".encode()
-                            elif usage_data:
-                                # Normally, only message-end event type has usage data. And we would yield a openai_chunk with usage data.
-                                # This is just in case
-                                usage_chunk = {
-                                    "id": message_id or uuid.uuid4(),
-                                    "object": "chat.completion.chunk",
-                                    "created": created,
-                                    "model": model,
-                                    "choices": [{"index": 0, "delta": {}}],
-                                    "usage": usage_data,
-                                }
-                                yield f"data: {json.dumps(usage_chunk)}\n\n".encode()
-                    except json.JSONDecodeError:
-                        logger.warning(f"Failed to parse Cohere chunk: {chunk[0]}")
-                        continue
-                    except Exception as e:
-                        logger.error(f"Error processing Cohere chunk: {e}")
-                        continue
+                                if 'usage' in cohere_chunk:
+                                    usage_data = self.convert_usage_data(cohere_chunk['usage'])
+
+                                if openai_chunk:
+                                    if usage_data:
+                                        openai_chunk["usage"] = usage_data
+                                    out += f"data: {json.dumps(openai_chunk)}\n\n".encode()
+                                elif usage_data:
+                                    # Normally, only message-end event type has usage data. And we would yield a openai_chunk with usage data.
+                                    # This is just in case
+                                    usage_chunk = {
+                                        "id": message_id or uuid.uuid4(),
+                                        "object": "chat.completion.chunk",
+                                        "created": created,
+                                        "model": model,
+                                        "choices": [{"index": 0, "delta": {}}],
+                                        "usage": usage_data,
+                                    }
+                                    out += f"data: {json.dumps(usage_chunk)}\n\n".encode()
+                            except json.JSONDecodeError:
+                                logger.warning(f"Failed to parse Cohere chunk: {bytes(view[event_start:end])}")
+                            except (KeyError, AttributeError, TypeError) as e:
+                                # Well-formed JSON with an unexpected shape
+                                logger.error(f"Error processing Cohere chunk: {e}")
+
+                    del buffer[:start]
+                    if out:
+                        yield bytes(out)
 
                 # # Send final [DONE] message
                 yield b"data: [DONE]\n\n"
@@ -322,18 +338,18 @@ class CohereAdapter(ProviderAdapter):
             "Authorization": f"Bearer {api_key}",
             "Content-Type": "application/json",
         }
-        async with aiohttp.ClientSession() as session:
-            async with session.post(url, headers=headers, json=payload) as response:
-                if response.status != HTTPStatus.OK:
-                    error_text = await response.text()
-                    logger.error(f"Completion API error for {self.provider_name}: {error_text}")
-                    raise ProviderAPIException(
-                        provider_name=self.provider_name,
-                        error_code=response.status,
-                        error_message=error_text
-                    )
-                resp = await response.json()
-                return self._convert_cohere_to_openai(resp, payload["model"])
+        session = await get_http_session()
+        async with session.post(url, headers=headers, json=payload) as response:
+            if response.status != HTTPStatus.OK:
+                error_text = await response.text()
+                logger.error(f"Completion API error for {self.provider_name}: {error_text}")
+                raise ProviderAPIException(
+                    provider_name=self.provider_name,
+                    error_code=response.status,
+                    error_message=error_text
+                )
+            resp = await response.json()
+            return self._convert_cohere_to_openai(resp, payload["model"])
 
     async def process_completion(
         self, endpoint: str, payload: dict[str, Any], api_key: str
@@ -395,6 +411,54 @@ class CohereAdapter(ProviderAdapter):
             usage["total_tokens"] = billed_units.get("output_tokens", billed_units.get("input_tokens", 0))
         return openai_response
     
+    async def _embed_batch(
+        self,
+        session: aiohttp.ClientSession,
+        url: str,
+        headers: dict[str, str],
+        cohere_payload: dict[str, Any],
+        model: str,
+        offset: int = 0,
+        semaphore: asyncio.Semaphore | None = None,
+    ) -> dict[str, Any]:
+        """Embed a single batch of texts, numbering results from ``offset``.
+
+        Rate limits, server errors and network errors are retried with backoff;
+        embedding is idempotent, so a resent batch does no harm.
+        """
+        for attempt in range(EMBED_MAX_RETRIES + 1):
+            try:
+                async with (
+                    semaphore or contextlib.nullcontext(),
+                    session.post(url, headers=headers, json=cohere_payload) as response,
+                ):
+                    if response.status != HTTPStatus.OK:
+                        error_text = await response.text()
+                        logger.error(f"Embeddings API error for {self.provider_name}: {error_text}")
+                        raise ProviderAPIException(
+                            provider_name=self.provider_name,
+                            error_code=response.status,
+                            error_message=error_text
+                        )
+                    response_json = await response.json()
+                break
+            except ProviderAPIException as e:
+                if attempt == EMBED_MAX_RETRIES or not (
+                    e.error_code == HTTPStatus.TOO_MANY_REQUESTS or e.error_code >= 500
+                ):
+                    raise
+            except (aiohttp.ClientError, TimeoutError):
+                if attempt == EMBED_MAX_RETRIES:
+                    raise
+            logger.warning("Embeddings API batch failed for {}, retrying", self.provider_name)
+            await asyncio.sleep(min(10.0, 0.5 * 2**attempt) * random.uniform(0.5, 1.5))
+
+        openai_response = self.convert_cohere_embeddings_response_to_openai(response_json, model)
+        if offset:
+            for item in openai_response["data"]:
+                item["index"] += offset
+        return openai_response
+
     async def process_embeddings(
         self, endpoint: str, payload: dict[str, Any], api_key: str
     ) -> Any:
@@ -407,20 +471,47 @@ class CohereAdapter(ProviderAdapter):
         }
 
         cohere_payload = self.convert_openai_embeddings_payload_to_cohere(payload)
+        texts = cohere_payload.get("texts", [])
 
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.post(url, headers=headers, json=cohere_payload) as response:
-                    if response.status != HTTPStatus.OK:
-                        error_text = await response.text()
-                        logger.error(f"Embeddings API error for {self.provider_name}: {error_text}")
-                        raise ProviderAPIException(
-                            provider_name=self.provider_name,
-                            error_code=response.status,
-                            error_message=error_text
+            session = await get_http_session()
+            if len(texts) <= MAX_EMBED_BATCH_SIZE:
+                return await self._embed_batch(
+                    session, url, headers, cohere_payload, payload["model"]
+                )
+
+            # Split oversized inputs into Cohere-sized batches and send a bounded
+            # number of them at a time, then merge in input order. The task group
+            # cancels the remaining batches on the first failure, so no more are
+            # billed for a request that has already failed
+            semaphore = asyncio.Semaphore(MAX_CONCURRENT_EMBEDDING_BATCHES)
+            try:
+                async with asyncio.TaskGroup() as tg:
+                    tasks = [
+                        tg.create_task(
+                            self._embed_batch(
+                                session,
+                                url,
+                                headers,
+                                {**cohere_payload, "texts": texts[offset : offset + MAX_EMBED_BATCH_SIZE]},
+                                payload["model"],
+                                offset,
+                                semaphore,
+                            )
                         )
-                    response_json = await response.json()
-                    return self.convert_cohere_embeddings_response_to_openai(response_json, payload["model"])
+                        for offset in range(0, len(texts), MAX_EMBED_BATCH_SIZE)
+                    ]
+            except ExceptionGroup as eg:
+                # Surface the first batch failure as if it were the only one
+                raise eg.exceptions[0] from None
+            batch_responses = [task.result() for task in tasks]
+            openai_response = batch_responses[0]
+            usage = openai_response["usage"]
+            for batch_response in batch_responses[1:]:
+                openai_response["data"].extend(batch_response["data"])
+                usage["prompt_tokens"] += batch_response["usage"]["prompt_tokens"]
+                usage["total_tokens"] += batch_response["usage"]["total_tokens"]
+            return openai_response
         except BaseForgeException as e:
             raise e
         except Exception as e:
@@ -1,3 +1,4 @@
+import functools
 from typing import Any
 
 from app.core.logger import get_logger
@@ -6,6 +7,25 @@ from .openai_adapter import OpenAIAdapter
 # Configure logging
 logger = get_logger(name="gemini_openai_adapter")
 
+GEMINI_DEFAULT_BASE_URL = "https://generativelanguage.googleapis.com/v1beta"
+
+
+@functools.lru_cache(maxsize=64)
+def _normalize_gemini_base(base_url: str | None) -> str:
+    """Return the OpenAI-compatible Gemini endpoint for ``base_url``.
+
+    Adapters are built per request, so the normalised URL is memoised.
+    """
+    # Default base URL if none supplied
+    if not base_url:
+        base_url = GEMINI_DEFAULT_BASE_URL
+
+    # Ensure the URL ends with the OpenAI compatibility suffix
+    base_url = base_url.rstrip("/")
+    if not base_url.endswith("/openai"):
+        base_url = f"{base_url}/openai"
+    return base_url
+
 
 class GeminiOpenAIAdapter(OpenAIAdapter):
     """Adapter for Google Gemini via the OpenAI-compatible endpoint
@@ -24,15 +44,7 @@ class GeminiOpenAIAdapter(OpenAIAdapter):
         base_url: str | None,
         config: dict[str, Any] | None = None,
     ):
-        # Default base URL if none supplied
-        if not base_url:
-            base_url = "https://generativelanguage.googleapis.com/v1beta"
-
-        # Ensure the URL ends with the OpenAI compatibility suffix
-        base_url = base_url.rstrip("/")
-        if not base_url.endswith("/openai"):
-            base_url = f"{base_url}/openai"
-
-        logger.debug(f"Initialised GeminiOpenAIAdapter with base_url={base_url}")
+        base_url = _normalize_gemini_base(base_url)
+        logger.debug("Initialised GeminiOpenAIAdapter with base_url={}", base_url)
 
         super().__init__(provider_name, base_url, config=config or {}) 
\ No newline at end of file
@@ -8,16 +8,25 @@ wraps the same functionality via the standardized REST surface.
 and for reference while migrating any bespoke features that haven’t yet been
 replicated in the new adapter. **It will be removed in a future release.**
 """
-import json
+import asyncio
+import copy
+import hashlib
 import os
+import random
+import re
 import time
 import uuid
-from collections.abc import AsyncGenerator
+from collections.abc import AsyncGenerator, AsyncIterator
+from contextlib import AsyncExitStack, asynccontextmanager
 from http import HTTPStatus
-from typing import Any
+from typing import Any, ClassVar
 
 import aiohttp
+import orjson
+from aiolimiter import AsyncLimiter
 
+from app.core.async_cache import cache_provider_response_async, get_cached_provider_response_async
+from app.core.http_client import HTTP_POOL_LIMIT_PER_HOST, get_http_session
 from app.core.logger import get_logger
 from app.exceptions.exceptions import BaseForgeException, BaseInvalidRequestException, ProviderAPIException, InvalidCompletionRequestException, \
     InvalidEmbeddingsRequestException
@@ -27,8 +36,119 @@ from .base import ProviderAdapter
 # Configure logging
 logger = get_logger(name="google_adapter")
 
+# Resumable upload chunk size, a multiple of the 256 KiB granularity Gemini requires
+GOOGLE_UPLOAD_CHUNK_SIZE = max(
+    1, int(os.getenv("GOOGLE_UPLOAD_CHUNK_SIZE", str(8 * 1024 * 1024))) // (256 * 1024)
+) * (256 * 1024)
+GOOGLE_UPLOAD_MAX_RETRIES = 3
+# Retries for rate limited (429) or failed (5xx) JSON requests
+GOOGLE_MAX_RETRIES = int(os.getenv("GOOGLE_MAX_RETRIES", "2"))
+# Seconds to cache responses to deterministic requests for, 0 disables it
+GOOGLE_RESPONSE_CACHE_TTL = int(os.getenv("GOOGLE_RESPONSE_CACHE_TTL", "0"))
+# Maximum number of Gemini requests per process waiting for response headers
+GOOGLE_MAX_CONCURRENCY = int(os.getenv("GOOGLE_MAX_CONCURRENCY", str(HTTP_POOL_LIMIT_PER_HOST)))
+# Seconds a request waits for a free request slot before failing with a 503
+GOOGLE_SLOT_TIMEOUT = float(os.getenv("GOOGLE_SLOT_TIMEOUT", "30"))
+# Optional cap on Gemini requests per minute per process, 0 disables it
+GOOGLE_RATE_LIMIT_RPM = int(os.getenv("GOOGLE_RATE_LIMIT_RPM", "0"))
+
+# SSE framing for OpenAI-style chunks emitted while streaming
+_DUMPS = orjson.dumps
+_SSE_PREFIX = b"data: "
+_SSE_SUFFIX = b"\n\n"
+_SSE_DONE = b"data: [DONE]\n\n"
+
+
+def _sse_event(chunk: dict[str, Any]) -> bytes:
+    """Frame ``chunk`` as an SSE data event with a single bytes allocation"""
+    return b"".join((_SSE_PREFIX, _DUMPS(chunk), _SSE_SUFFIX))
+
+
+# The first streamed chunk is always the same, so serialise it once
+_SSE_INITIAL_CHUNK = _sse_event({"choices": [{"delta": {"role": "assistant"}, "index": 0}]})
+
+# Bytes that can change the nesting state of a JSON document
+_JSON_STRUCTURAL = re.compile(rb'[{}"\\]')
+
+
+def _parse_data_url(data_url: str) -> tuple[str, str]:
+    """Split a data URL into its media type (e.g. "image/jpeg") and base64 payload.
+
+    Only the header is scanned, so this is cheap however large the image is.
+    """
+    sep = data_url.index(",")
+    params = data_url.find(";", 0, sep)
+    return data_url[5 : params if params != -1 else sep], data_url[sep + 1 :]
+
+
+class _JsonObjectScanner:
+    """Incrementally split a streamed JSON array into its top-level objects.
+
+    Only structural bytes are visited and each is visited once, so the cost is
+    linear in the size of the response however it is chunked.
+    """
+
+    def __init__(self) -> None:
+        self._buffer = bytearray()
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+
+    def feed(self, data: bytes) -> list[bytearray]:
+        """Add ``data`` and return every object completed by it"""
+        buffer = self._buffer
+        buffer += data
+        objects = []
+        start = 0 if self._depth else -1
+        pos = self._pos
+        while True:
+            match = _JSON_STRUCTURAL.search(buffer, pos)
+            if match is None:
+                pos = len(buffer)
+                break
+            idx = match.start()
+            byte = buffer[idx]
+            pos = idx + 1
+            if byte == 0x5C:  # backslash escapes the next byte
+                if pos == len(buffer):
+                    # Escaped byte not received yet, rescan the backslash
+                    pos = idx
+                    break
+                pos += 1
+            elif byte == 0x22:  # quote
+                self._in_string = not self._in_string
+            elif self._in_string:
+                continue
+            elif byte == 0x7B:  # {
+                if self._depth == 0:
+                    start = idx
+                self._depth += 1
+            elif self._depth:  # }
+                self._depth -= 1
+                if self._depth == 0:
+                    objects.append(buffer[start:pos])
+                    start = -1
+
+        # Keep only the unfinished object, if any
+        if start == -1:
+            del buffer[:]
+            self._pos = 0
+        else:
+            del buffer[:start]
+            self._pos = pos - start
+        return objects
+
 
 class GoogleAdapter(ProviderAdapter):
+    # The shared HTTP session the outbound limits below were created for; it
+    # is bound to an event loop, so they are rebuilt along with it
+    _session: ClassVar[aiohttp.ClientSession | None] = None
+    # Outbound limits, bound to the same event loop as the session
+    _semaphore: ClassVar[asyncio.Semaphore | None] = None
+    _rate_limiter: ClassVar[AsyncLimiter | None] = None
+    # In-flight /models fetches, keyed like the models cache
+    _models_fetches: ClassVar[dict[str, asyncio.Future]] = {}
+
     def __init__(
         self,
         provider_name: str,
@@ -37,6 +157,8 @@ class GoogleAdapter(ProviderAdapter):
     ):
         self._provider_name = provider_name
         self._base_url = base_url
+        # Display name -> model name, filled in by list_models
+        self.GOOGLE_MODEL_MAPPING: dict[str, str] = {}
 
     @property
     def provider_name(self) -> str:
@@ -50,6 +172,119 @@ class GoogleAdapter(ProviderAdapter):
         """Get the Google-specific model name"""
         return self.GOOGLE_MODEL_MAPPING.get(model, model)
 
+    @classmethod
+    async def _get_session(cls) -> aiohttp.ClientSession:
+        """Return the shared HTTP session, with the outbound limits bound to it"""
+        session = await get_http_session()
+        if cls._session is not session:
+            cls._session = session
+            cls._semaphore = asyncio.Semaphore(GOOGLE_MAX_CONCURRENCY)
+            cls._rate_limiter = AsyncLimiter(GOOGLE_RATE_LIMIT_RPM, 60) if GOOGLE_RATE_LIMIT_RPM > 0 else None
+        return session
+
+    def _response_cache_key(self, kind: str, api_key: str, payload: dict[str, Any]) -> str | None:
+        """Key for caching the response to ``payload``, or None when it must not be cached.
+
+        Only embeddings and non-streaming, temperature 0 completions without
+        stop sequences or tools are deterministic enough to be reused.
+        """
+        if GOOGLE_RESPONSE_CACHE_TTL <= 0:
+            return None
+        if kind == "completion" and (
+            payload.get("temperature") != 0
+            or payload.get("stream")
+            or payload.get("stop")
+            or payload.get("tools")
+        ):
+            return None
+        digest = hashlib.sha256(
+            api_key.encode() + orjson.dumps(payload, option=orjson.OPT_SORT_KEYS)
+        ).hexdigest()
+        return f"{self.provider_name}:{kind}:{digest}"
+
+    @staticmethod
+    def _served_from_cache(response: dict[str, Any]) -> dict[str, Any]:
+        """Copy of a cached response with its token usage zeroed.
+
+        A cache hit costs no provider tokens, so reporting the original usage
+        would bill the caller again; the copy keeps callers from mutating the cache.
+        """
+        response = copy.deepcopy(response)
+        usage = response.get("usage")
+        if isinstance(usage, dict):
+            for key, value in usage.items():
+                if isinstance(value, int):
+                    usage[key] = 0
+                elif isinstance(value, dict):
+                    usage[key] = {k: 0 if isinstance(v, int) else v for k, v in value.items()}
+        return response
+
+    @classmethod
+    @asynccontextmanager
+    async def _request(
+        cls, method: str, url: str, **kwargs: Any
+    ) -> AsyncIterator[aiohttp.ClientResponse]:
+        """Send a Gemini request on the shared session, within the concurrency and rate limits.
+
+        The concurrency slot is only held until the response headers arrive, so
+        long streamed bodies don't starve other requests of slots.
+        """
+        session = await cls._get_session()
+        semaphore = cls._semaphore
+        try:
+            async with asyncio.timeout(GOOGLE_SLOT_TIMEOUT):
+                await semaphore.acquire()
+        except TimeoutError:
+            logger.warning("No free Gemini request slot within {}s", GOOGLE_SLOT_TIMEOUT)
+            raise ProviderAPIException(
+                provider_name="google",
+                error_code=HTTPStatus.SERVICE_UNAVAILABLE,
+                error_message="Too many concurrent requests, please retry later",
+            )
+        async with AsyncExitStack() as stack:
+            try:
+                if cls._rate_limiter is not None:
+                    await cls._rate_limiter.acquire()
+                response = await stack.enter_async_context(session.request(method, url, **kwargs))
+            finally:
+                semaphore.release()
+            yield response
+
+    async def _raise_for_status(self, response: aiohttp.ClientResponse, error_label: str) -> None:
+        """Raise ProviderAPIException if ``response`` is not a 200"""
+        if response.status != HTTPStatus.OK:
+            # Error bodies may lack a charset, so decode them leniently
+            error_text = (await response.read()).decode(errors="replace")
+            logger.error(f"{error_label} error for {self.provider_name}: {error_text}")
+            raise ProviderAPIException(
+                provider_name=self.provider_name,
+                error_code=response.status,
+                error_message=error_text
+            )
+
+    async def _request_json(self, method: str, url: str, error_label: str, **kwargs: Any) -> Any:
+        """Send a Gemini request and return its decoded JSON body.
+
+        Rate limited (429) and unavailable (503) responses are retried with
+        jittered exponential backoff, as Gemini rejects them before doing any
+        work. Other server errors are only retried for GET requests, since a
+        500 or 504 on a POST may come after a generation was already paid for.
+        """
+        for attempt in range(GOOGLE_MAX_RETRIES + 1):
+            async with self._request(method, url, **kwargs) as response:
+                status = response.status
+                if attempt < GOOGLE_MAX_RETRIES and (
+                    status in (HTTPStatus.TOO_MANY_REQUESTS, HTTPStatus.SERVICE_UNAVAILABLE)
+                    or (status >= 500 and method == "GET")
+                ):
+                    logger.warning(
+                        "{} returned {} for {}, retrying", error_label, status, self.provider_name
+                    )
+                else:
+                    await self._raise_for_status(response, error_label)
+                    return await response.json(loads=orjson.loads, content_type=None)
+            await asyncio.sleep(0.5 * 2**attempt * random.uniform(0.5, 1.5))
+
     async def list_models(self, api_key: str) -> list[str]:
         """List all models (verbosely) supported by the provider"""
         # Check cache first
@@ -57,31 +292,36 @@ class GoogleAdapter(ProviderAdapter):
         if cached_models is not None:
             return cached_models
 
-        # If not in cache, make API call
+        # On a cache miss, concurrent callers share a single in-flight fetch
+        fetch_key = self._models_cache_key(api_key, self._base_url)
+        fetch = self._models_fetches.get(fetch_key)
+        if fetch is None:
+            fetch = asyncio.ensure_future(self._fetch_models(api_key))
+            self._models_fetches[fetch_key] = fetch
+            fetch.add_done_callback(
+                lambda _: self._models_fetches.pop(fetch_key, None)
+            )
+
+        # Shield the shared fetch so one cancelled caller doesn't fail the rest
+        models, model_mapping = await asyncio.shield(fetch)
+        self.GOOGLE_MODEL_MAPPING = model_mapping
+        return models
+
+    async def _fetch_models(self, api_key: str) -> tuple[list[str], dict[str, str]]:
+        """Fetch and cache the models list, returning it with the display name mapping"""
         url = f"{self._base_url}/models"
 
-        async with (
-            aiohttp.ClientSession() as session,
-            session.get(url, params={"pageSize": 100, "key": api_key}) as response,
-        ):
-            if response.status != HTTPStatus.OK:
-                error_text = await response.text()
-                logger.error(f"List Models API error for {self.provider_name}: {error_text}")
-                raise ProviderAPIException(
-                    provider_name=self.provider_name,
-                    error_code=response.status,
-                    error_message=error_text
-                )
-            resp = await response.json()
-            self.GOOGLE_MODEL_MAPPING = {
-                d["displayName"]: d["name"] for d in resp["models"]
-            }
-            models = [d["name"] for d in resp["models"]]
+        resp = await self._request_json(
+            "GET", url, "List Models API", params={"pageSize": 100, "key": api_key}
+        )
 
-            # Cache the results
-            self.cache_models(api_key, self._base_url, models)
+        model_mapping = {d["displayName"]: d["name"] for d in resp["models"]}
+        models = [d["name"] for d in resp["models"]]
 
-            return models
+        # Cache the results
+        self.cache_models(api_key, self._base_url, models)
+
+        return models, model_mapping
 
     @staticmethod
     async def upload_file_to_gemini(
@@ -132,8 +372,8 @@ class GoogleAdapter(ProviderAdapter):
             "file": {"display_name": display_name or os.path.basename(file_url)}
         }
 
-        async with session.post(
-            f"{base_url}?key={api_key}", headers=headers, json=metadata
+        async with GoogleAdapter._request(
+            "POST", f"{base_url}?key={api_key}", headers=headers, json=metadata
         ) as response:
             if response.status != HTTPStatus.OK:
                 error_text = await response.text()
@@ -154,14 +394,8 @@ class GoogleAdapter(ProviderAdapter):
                     error_message=error_text
                 )
 
-        # Upload the file content using streaming
-        upload_headers = {
-            "Content-Length": str(file_size),
-            "X-Goog-Upload-Offset": "0",
-            "X-Goog-Upload-Command": "upload, finalize",
-        }
-
-        # Stream the file content directly from the source URL to Gemini API
+        # Stream the file content from the source URL to Gemini API in chunks,
+        # so a failed chunk is retried on its own
         async with session.get(file_url) as source_response:
             if source_response.status != HTTPStatus.OK:
                 error_text = await source_response.text()
@@ -172,11 +406,54 @@ class GoogleAdapter(ProviderAdapter):
                     error_message=error_text
                 )
 
-            async with session.put(
-                upload_url, headers=upload_headers, data=source_response.content
+            # The resumable protocol takes chunks strictly in offset order, so
+            # they are sent one after another. The next chunk is read ahead
+            # so that the last one can carry the finalize command. Each chunk
+            # is read into a single bytes object that is handed to aiohttp as
+            # is, and kept only for retries.
+            content = source_response.content
+            offset = 0
+            chunk = await GoogleAdapter._read_upload_chunk(content)
+            while next_chunk := await GoogleAdapter._read_upload_chunk(content):
+                await GoogleAdapter._upload_chunk(upload_url, chunk, offset, finalize=False)
+                offset += len(chunk)
+                chunk = next_chunk
+
+            return await GoogleAdapter._upload_chunk(
+                upload_url, chunk, offset, finalize=True
+            )
+
+    @staticmethod
+    async def _read_upload_chunk(content: aiohttp.StreamReader) -> bytes:
+        """Read the next upload chunk, which is shorter only at the end of the stream"""
+        try:
+            return await content.readexactly(GOOGLE_UPLOAD_CHUNK_SIZE)
+        except asyncio.IncompleteReadError as e:
+            return e.partial
+
+    @staticmethod
+    async def _upload_chunk(
+        upload_url: str, chunk: bytes, offset: int, finalize: bool
+    ) -> dict[str, Any] | None:
+        """Send one chunk of a resumable upload, retrying transient server errors.
+
+        Returns the file information once the upload is finalized.
+        """
+        headers = {
+            "X-Goog-Upload-Offset": str(offset),
+            "X-Goog-Upload-Command": "upload, finalize" if finalize else "upload",
+        }
+        for attempt in range(GOOGLE_UPLOAD_MAX_RETRIES + 1):
+            async with GoogleAdapter._request(
+                "PUT", upload_url, headers=headers, data=chunk
             ) as upload_response:
-                if upload_response.status != HTTPStatus.OK:
-                    error_text = await upload_response.text()
+                if upload_response.status == HTTPStatus.OK:
+                    if not finalize:
+                        return None
+                    return await upload_response.json(loads=orjson.loads, content_type=None)
+
+                error_text = await upload_response.text()
+                if upload_response.status < 500 or attempt == GOOGLE_UPLOAD_MAX_RETRIES:
                     logger.error(f"Gemini Upload API error: Failed to upload file: {error_text}")
                     raise ProviderAPIException(
                         provider_name="google",
@@ -184,7 +461,12 @@ class GoogleAdapter(ProviderAdapter):
                         error_message=error_text
                     )
 
-                return await upload_response.json()
+            logger.warning(
+                "Gemini upload chunk at offset {} failed with {}, retrying",
+                offset,
+                upload_response.status,
+            )
+            await asyncio.sleep(2**attempt * 0.5)
 
     @staticmethod
     async def convert_openai_image_content_to_google(
@@ -193,10 +475,7 @@ class GoogleAdapter(ProviderAdapter):
         """Convert OpenAI image content model to Google Gemini format"""
         data_url = msg["image_url"]["url"]
         if data_url.startswith("data:"):
-            # Extract media type and base64 data
-            parts = data_url.split(",", 1)
-            media_type = parts[0].split(":")[1].split(";")[0]  # e.g., "image/jpeg"
-            base64_data = parts[1]  # The actual base64 string without prefix
+            media_type, base64_data = _parse_data_url(data_url)
             return {
                 "inline_data": {
                     "mime_type": media_type,
@@ -207,10 +486,10 @@ class GoogleAdapter(ProviderAdapter):
             # download the image and upload it to Google Gemini
             # https://ai.google.dev/api/files#files_create_image-SHELL
             try:
-                async with aiohttp.ClientSession() as session:
-                    result = await GoogleAdapter.upload_file_to_gemini(
-                        session, data_url, api_key
-                    )
+                session = await GoogleAdapter._get_session()
+                result = await GoogleAdapter.upload_file_to_gemini(
+                    session, data_url, api_key
+                )
                 return {
                     "file_data": {
                         "mime_type": result["file"]["mimeType"],
@@ -238,24 +517,41 @@ class GoogleAdapter(ProviderAdapter):
             return [{"text": content}]
 
         try:
+            # Most messages are plain text and need no image handling
+            if all(msg.get("type") == "text" for msg in content):
+                return [{"text": msg["text"]} for msg in content]
+
             result = []
+            image_indices = []
+            image_coros = []
             for msg in content:
                 _type = msg["type"]
                 if _type == "text":
                     result.append({"text": msg["text"]})
                 elif _type == "image_url":
-                    result.append(
-                        await GoogleAdapter.convert_openai_image_content_to_google(
+                    # Filled in below once all images are converted
+                    image_indices.append(len(result))
+                    image_coros.append(
+                        GoogleAdapter.convert_openai_image_content_to_google(
                             msg, api_key
                         )
                     )
+                    result.append(None)
                 else:
+                    for coro in image_coros:
+                        coro.close()
                     error_text = f"{_type} is not supported"
                     logger.error(error_text)
                     raise InvalidCompletionRequestException(
                         provider_name="google",
                         error=ValueError(error_text)
                     )
+
+            # Images may need uploading, so convert them concurrently
+            for idx, image in zip(
+                image_indices, await asyncio.gather(*image_coros), strict=True
+            ):
+                result[idx] = image
             return result
         except BaseForgeException as e:
             raise e
@@ -305,8 +601,7 @@ class GoogleAdapter(ProviderAdapter):
         model_path = model if model.startswith("models/") else f"models/{model}"
         url = f"{self._base_url}/{model_path}:streamGenerateContent"
 
-        initial_chunk = {"choices": [{"delta": {"role": "assistant"}, "index": 0}]}
-        yield f"data: {json.dumps(initial_chunk)}\n\n".encode()
+        yield _SSE_INITIAL_CHUNK
 
         request_id = f"chatcmpl-{uuid.uuid4()}"
 
@@ -327,92 +622,74 @@ class GoogleAdapter(ProviderAdapter):
                 )
             headers = {"Content-Type": "application/json", "Accept": "application/json"}
 
-            async with (
-                aiohttp.ClientSession() as session,
-                session.post(
-                    url, params={"key": api_key}, json=google_payload, headers=headers
-                ) as response,
-            ):
-                if response.status != HTTPStatus.OK:
-                    error_text = await response.text()
-                    logger.error(f"Completion Streaming API error for {self.provider_name}: {error_text}")
-                    raise ProviderAPIException(
-                        provider_name=self.provider_name,
-                        error_code=response.status,
-                        error_message=error_text
-                    )
-
-                # Process response in chunks
-                buffer = ""
-                async for chunk in response.content.iter_chunks():
-                    if not chunk[0]:  # Empty chunk
-                        continue
-
-                    buffer += chunk[0].decode("utf-8")
-
-                    # Try to find complete JSON objects in the buffer
-                    while True:
+            async with self._request(
+                "POST", url, params={"key": api_key}, json=google_payload, headers=headers
+            ) as response:
+                await self._raise_for_status(response, "Completion Streaming API")
+
+                # The stream is a JSON array of GenerateContentResponse objects;
+                # split it into objects as bytes arrive
+                scanner = _JsonObjectScanner()
+                # Fields shared by every chunk of this stream
+                chunk_template = {
+                    "id": request_id,
+                    "object": "chat.completion.chunk",
+                    "created": int(time.time()),
+                    "model": model,
+                }
+                async for data in response.content.iter_any():
+                    for raw_obj in scanner.feed(data):
                         try:
-                            # Find the start of a JSON object
-                            usage_data = None
-                            openai_chunk = {
-                                "id": request_id,
-                                "object": "chat.completion.chunk",
-                                "created": int(time.time()),
-                                "model": model,
-                                "choices": [{"index": 0, "delta": {"content": ""}}],
-                            }
-                            start_idx = buffer.find("{")
-                            if start_idx == -1:
-                                break
-
-                            # Try to parse from the start of the object
-                            json_obj = json.loads(buffer[start_idx:])
-                            # If successful, process the object and remove it from buffer
-                            buffer = buffer[:start_idx]
-
-                            # Process the JSON object
-                            if "usageMetadata" in json_obj:
-                                usage_data = self.format_google_usage(
-                                    json_obj["usageMetadata"]
+                            json_obj = orjson.loads(raw_obj)
+                        except orjson.JSONDecodeError:
+                            logger.warning(f"Failed to parse Google stream object: {raw_obj[:200]}")
+                            continue
+
+                        usage_data = None
+                        openai_chunk = {
+                            **chunk_template,
+                            "choices": [{"index": 0, "delta": {"content": ""}}],
+                        }
+
+                        # Process the JSON object
+                        if "usageMetadata" in json_obj:
+                            usage_data = self.format_google_usage(
+                                json_obj["usageMetadata"]
+                            )
+
+                        if "candidates" in json_obj:
+                            choices = []
+                            for c_idx, candidate in enumerate(
+                                json_obj.get("candidates", [])
+                            ):
+                                parts = candidate.get("content", {}).get("parts", [])
+                                # Streamed candidates usually carry a single text part
+                                text_content = (
+                                    parts[0].get("text", "")
+                                    if len(parts) == 1
+                                    else "".join([p["text"] for p in parts if "text" in p])
                                 )
+                                finish_reason = candidate.get("finishReason")
 
+                                choices.append({
+                                    "index": c_idx,
+                                    "delta": {"content": text_content},
+                                    **({"finish_reason": finish_reason.lower()}
+                                    if finish_reason
+                                    else {})
+                                })
+                            if not choices:
+                                choices = [{"index": 0, "delta": {"content": ""}}]
 
-                            if "candidates" in json_obj:
-                                choices = []
-                                for c_idx, candidate in enumerate(
-                                    json_obj.get("candidates", [])
-                                ):
-                                    content = candidate.get("content", {})
-                                    text_content = "".join(
-                                        p.get("text", "")
-                                        for p in content.get("parts", [])
-                                    )
-                                    finish_reason = candidate.get("finishReason")
-
-                                    choices.append({
-                                        "index": c_idx,
-                                        "delta": {"content": text_content},
-                                        **({"finish_reason": finish_reason.lower()}
-                                        if finish_reason
-                                        else {})
-                                    })
-                                if not choices:
-                                    choices = [{"index": 0, "delta": {"content": ""}}]
+                            openai_chunk["choices"] = choices
 
-                                openai_chunk["choices"] = choices
+                        if usage_data:
+                            openai_chunk["usage"] = usage_data
 
-                            if usage_data:
-                                openai_chunk["usage"] = usage_data
-
-                            yield f"data: {json.dumps(openai_chunk)}\n\n".encode()
-
-                        except json.JSONDecodeError:
-                            # Incomplete JSON, wait for more data
-                            break
+                        yield _sse_event(openai_chunk)
 
             # Send final [DONE] message
-            yield b"data: [DONE]\n\n"
+            yield _SSE_DONE
 
         except Exception as e:
             logger.error(f"Google streaming API error: {str(e)}", exc_info=True)
@@ -424,8 +701,8 @@ class GoogleAdapter(ProviderAdapter):
                 "choices": [{"index": 0, "delta": {}, "finish_reason": "error"}],
                 "error": {"message": str(e), "type": "api_error"},
             }
-            yield f"data: {json.dumps(error_chunk)}\n\n".encode()
-            yield b"data: [DONE]\n\n"
+            yield _sse_event(error_chunk)
+            yield _SSE_DONE
 
     @staticmethod
     def format_google_usage(metadata: dict) -> dict:
@@ -466,12 +743,18 @@ class GoogleAdapter(ProviderAdapter):
         google_contents = []
         system_content = []
 
-        for msg in messages:
+        # Convert all message contents concurrently, any image uploads included
+        converted_contents = await asyncio.gather(
+            *[
+                GoogleAdapter.convert_openai_content_to_google(
+                    msg.get("content", ""), api_key
+                )
+                for msg in messages
+            ]
+        )
+
+        for msg, content in zip(messages, converted_contents, strict=True):
             role = msg.get("role", "")
-            content = msg.get("content", "")
-            content = await GoogleAdapter.convert_openai_content_to_google(
-                content, api_key
-            )
 
             if role == "system":
                 # Google requires a system message to be string
@@ -497,6 +780,10 @@ class GoogleAdapter(ProviderAdapter):
         """Process a regular (non-streaming) chat completion with Google Gemini"""
         model = payload.get("model", "")
 
+        cache_key = self._response_cache_key("completion", api_key, payload)
+        if cache_key and (cached := await get_cached_provider_response_async(cache_key)):
+            return self._served_from_cache(cached)
+
         # Convert payload to Google format
         google_payload = await self.convert_openai_completion_payload_to_google(payload, api_key)
 
@@ -518,26 +805,15 @@ class GoogleAdapter(ProviderAdapter):
                     error=ValueError(error_text)
                 )
 
-            async with (
-                aiohttp.ClientSession() as session,
-                session.post(
-                    url, params={"key": api_key}, json=google_payload, headers=headers
-                ) as response,
-            ):
-                response_status = response.status
-                if response_status != HTTPStatus.OK:
-                    error_text = await response.text()
-                    logger.error(f"Completion API error for {self.provider_name}: {error_text}")
-                    raise ProviderAPIException(
-                        provider_name=self.provider_name,
-                        error_code=response_status,
-                        error_message=error_text
-                    )
-
-                response_json = await response.json()
+            response_json = await self._request_json(
+                "POST", url, "Completion API", params={"key": api_key}, json=google_payload, headers=headers
+            )
 
-                # Convert to OpenAI format
-                return self.convert_google_completion_response_to_openai(response_json, model)
+            # Convert to OpenAI format
+            openai_response = self.convert_google_completion_response_to_openai(response_json, model)
+            if cache_key:
+                await cache_provider_response_async(cache_key, openai_response, ttl=GOOGLE_RESPONSE_CACHE_TTL)
+            return openai_response
         except BaseForgeException as e:
             raise e
         except Exception as e:
@@ -581,10 +857,7 @@ class GoogleAdapter(ProviderAdapter):
             parts = content.get("parts", [])
 
             # Extract text from parts
-            text_content = ""
-            for part in parts:
-                if "text" in part:
-                    text_content += part["text"]
+            text_content = "".join([part["text"] for part in parts if "text" in part])
 
             # Determine finish reason
             finish_reason = candidate.get("finishReason", "").lower()
@@ -608,8 +881,14 @@ class GoogleAdapter(ProviderAdapter):
         return openai_response
     
     @staticmethod
-    def convert_openai_embeddings_payload_to_google(payload: dict[str, Any]) -> dict[str, Any]:
-        """Convert OpenAI-format embeddings payload to Google Gemini format"""
+    def convert_openai_embeddings_payload_to_google(
+        payload: dict[str, Any], model_path: str | None = None
+    ) -> dict[str, Any]:
+        """Convert OpenAI-format embeddings payload to Google Gemini format
+
+        A list input becomes a batchEmbedContents payload with one request per
+        item, so that each item gets its own embedding.
+        """
         google_payload = {}
         if "dimensions" in payload:
             google_payload["outputDimensionality"] = payload["dimensions"]
@@ -618,7 +897,12 @@ class GoogleAdapter(ProviderAdapter):
         if isinstance(input, str):
             google_payload["content"] = {"parts": [{"text": input}]}
         elif isinstance(input, list):
-            google_payload["content"] = {"parts": [{"text": text} for text in input]}
+            return {
+                "requests": [
+                    {"model": model_path, "content": {"parts": [{"text": text}]}, **google_payload}
+                    for text in input
+                ]
+            }
         
         return google_payload
     
@@ -635,13 +919,20 @@ class GoogleAdapter(ProviderAdapter):
                 "total_tokens": 0,
             },
         }
-        values = response_json["embedding"]["values"]
-        if values:
-            openai_response["data"] = [{
+        # batchEmbedContents returns a list, embedContent a single embedding
+        if "embeddings" in response_json:
+            embeddings = response_json["embeddings"]
+        else:
+            embeddings = [response_json["embedding"]]
+        openai_response["data"] = [
+            {
                 "object": "embedding",
-                "embedding": values,
-                "index": 0,
-            }]
+                "embedding": embedding["values"],
+                "index": idx,
+            }
+            for idx, embedding in enumerate(embeddings)
+            if embedding.get("values")
+        ]
         
         return openai_response
     
@@ -659,10 +950,16 @@ class GoogleAdapter(ProviderAdapter):
         # Properly format the model name for the API request using ternary operator
         model_path = model if model.startswith("models/") else f"models/{model}"
 
-        url = f"{self._base_url}/{model_path}:embedContent"
+        # Embed a list of inputs in one round trip
+        method = "batchEmbedContents" if isinstance(payload["input"], list) else "embedContent"
+        url = f"{self._base_url}/{model_path}:{method}"
+
+        cache_key = self._response_cache_key("embeddings", api_key, payload)
+        if cache_key and (cached := await get_cached_provider_response_async(cache_key)):
+            return self._served_from_cache(cached)
 
         # Convert payload to Google format
-        google_payload = self.convert_openai_embeddings_payload_to_google(payload)
+        google_payload = self.convert_openai_embeddings_payload_to_google(payload, model_path)
 
         try:
             headers = {"Content-Type": "application/json", "Accept": "application/json"}
@@ -676,24 +973,14 @@ class GoogleAdapter(ProviderAdapter):
                     error=ValueError(error_text)
                 )
 
-            async with (
-                aiohttp.ClientSession() as session,
-                session.post(
-                    url, params={"key": api_key}, json=google_payload, headers=headers
-                ) as response,
-            ):
-                response_status = response.status
-                if response_status != HTTPStatus.OK:
-                    error_text = await response.text()
-                    logger.error(f"Embeddings API error for {self.provider_name}: {error_text}")
-                    raise ProviderAPIException(
-                        provider_name=self.provider_name,
-                        error_code=response_status,
-                        error_message=error_text
-                    )
+            response_json = await self._request_json(
+                "POST", url, "Embeddings API", params={"key": api_key}, json=google_payload, headers=headers
+            )
 
-                response_json = await response.json()
-                return self.convert_google_embeddings_response_to_openai(response_json, model)
+            openai_response = self.convert_google_embeddings_response_to_openai(response_json, model)
+            if cache_key:
+                await cache_provider_response_async(cache_key, openai_response, ttl=GOOGLE_RESPONSE_CACHE_TTL)
+            return openai_response
         except BaseForgeException as e:
             raise e
         except Exception as e:
@@ -2,17 +2,32 @@
 Mock provider adapter for testing purposes.
 """
 
-from collections.abc import AsyncGenerator
+from collections.abc import AsyncGenerator, Mapping
+from itertools import chain
+from types import MappingProxyType
 from typing import Any
 
 from .base import ProviderAdapter
 from .mock_provider import (
+    STREAM_DONE,
     generate_mock_chat_stream,
     get_mock_chat_completion,
     get_mock_models,
     get_mock_text_completion,
 )
 
+# Mock-only model names and the mock implementations they map to
+_MOCK_MODEL_MAPPING: Mapping[str, str] = MappingProxyType(
+    {
+        "mock-only-gpt-3.5-turbo": "mock-gpt-3.5-turbo",
+        "mock-only-gpt-4": "mock-gpt-4",
+        "mock-only-gpt-4o": "mock-gpt-4o",
+        "mock-only-claude-3-opus": "mock-claude-3-opus",
+        "mock-only-claude-3-sonnet": "mock-claude-3-sonnet",
+        "mock-only-claude-3-haiku": "mock-claude-3-haiku",
+    }
+)
+
 
 class MockAdapter(ProviderAdapter):
     """Adapter for the Mock provider"""
@@ -27,16 +42,9 @@ class MockAdapter(ProviderAdapter):
         return self._provider_name
 
     @property
-    def model_mapping(self) -> dict[str, str]:
+    def model_mapping(self) -> Mapping[str, str]:
         """Return the model mapping"""
-        return {
-            "mock-only-gpt-3.5-turbo": "mock-gpt-3.5-turbo",
-            "mock-only-gpt-4": "mock-gpt-4",
-            "mock-only-gpt-4o": "mock-gpt-4o",
-            "mock-only-claude-3-opus": "mock-claude-3-opus",
-            "mock-only-claude-3-sonnet": "mock-claude-3-sonnet",
-            "mock-only-claude-3-haiku": "mock-claude-3-haiku",
-        }
+        return _MOCK_MODEL_MAPPING
 
     async def process_completion(
         self,
@@ -135,18 +143,15 @@ class MockAdapter(ProviderAdapter):
 
     async def list_models(self, api_key: str, base_url: str | None = None) -> list[str]:
         """List available models from the mock provider"""
-        # Return the full list of mock model IDs
-        mock_models = get_mock_models()
-        mock_model_ids = [m["id"] for m in mock_models]
-
-        # Add the keys from the model mapping (mock-only-* prefixed models)
-        # instead of the values (which are the mock-* implementation names)
-        mapped_models = list(self.model_mapping.keys())
-
-        # Return both types of mock models
-        all_models = list(set(mock_model_ids + mapped_models))
-
-        return all_models
+        # Return the full list of mock model IDs, followed by the keys from the
+        # model mapping (mock-only-* prefixed models) rather than the values
+        # (which are the mock-* implementation names). Ordered dedup keeps the
+        # result stable between calls.
+        return list(
+            dict.fromkeys(
+                chain((m["id"] for m in get_mock_models()), self.model_mapping)
+            )
+        )
 
     async def stream_chat_completion(
         self,
@@ -164,6 +169,6 @@ class MockAdapter(ProviderAdapter):
             max_tokens=max_tokens,
             **kwargs,
         ):
-            if chunk == "[DONE]":
+            if chunk == STREAM_DONE:
                 return
             yield {"chunk": chunk}
@@ -12,6 +12,8 @@ from typing import Any
 
 # Constants
 MAX_PREVIEW_LENGTH = 20  # Maximum length for preview text before truncating
+# Final item of generate_mock_chat_stream, the SSE end-of-stream marker
+STREAM_DONE = "[DONE]"
 
 fake_responses = {
     "chat": [
@@ -225,7 +227,7 @@ async def generate_mock_chat_stream(
         }
     )
 
-    yield "[DONE]"
+    yield STREAM_DONE
 
 
 class MockClient:
@@ -433,7 +435,7 @@ class MockChatCompletionStream:
         async for chunk_text in generate_mock_chat_stream(
             self.model, self.messages, **self.kwargs
         ):
-            if chunk_text == "[DONE]":
+            if chunk_text == STREAM_DONE:
                 break
 
             chunk_data = json.loads(chunk_text)
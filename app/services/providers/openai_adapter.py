@@ -1,13 +1,29 @@
-from collections.abc import AsyncGenerator
+import asyncio
+import contextlib
+import functools
+import hashlib
+import os
+import random
+from collections.abc import AsyncGenerator, Callable
+from dataclasses import dataclass
 from http import HTTPStatus
-from typing import Any
+from itertools import chain
+from types import MappingProxyType
+from typing import Any, ClassVar
 
 import aiohttp
+import orjson
+import tiktoken
+from yarl import URL
+
+from app.core.async_cache import cache_embeddings_async, get_cached_embeddings_async
+from app.core.http_client import HTTP_POOL_LIMIT, get_http_session
 from app.core.logger import get_logger
 from app.exceptions.exceptions import (
-    ProviderAPIException,
     BaseInvalidRequestException,
+    ProviderAPIException,
 )
+from app.utils.sse import iter_sse_events
 
 from .base import ProviderAdapter
 
@@ -17,11 +33,90 @@ logger = get_logger(name="openai_adapter")
 
 MAX_BATCH_SIZE = 2048
 MAX_TOKENS_PER_BATCH = 8192  # OpenAI's limit for embeddings
+# Additive-increase/multiplicative-decrease bounds for the adaptive batch limit
+MIN_TOKENS_PER_BATCH = 512
+BATCH_TOKENS_INCREASE = 128
+# Retries for embedding batches that were rate limited (429), failed (5xx) or hit a network error
+EMBED_MAX_RETRIES = int(os.getenv("EMBED_MAX_RETRIES", "3"))
+# Requests with at least this many inputs or characters are tokenized and batched off the event loop
+TOKENIZE_IN_THREAD_MIN_INPUTS = 100
+TOKENIZE_IN_THREAD_MIN_CHARS = 1000
+# Maximum number of embedding batches of one request sent at once
+MAX_CONCURRENT_EMBEDDING_BATCHES = int(os.getenv("EMBED_MAX_CONCURRENCY", "8"))
+
+# Maximum number of in-flight requests per process across OpenAI-compatible
+# providers, by default as many as the shared connection pool allows
+OPENAI_ADAPTER_CONCURRENCY = int(os.getenv("OPENAI_ADAPTER_CONCURRENCY", str(HTTP_POOL_LIMIT)))
+# Maximum number of in-flight requests per process for a single provider API key
+OPENAI_KEY_CONCURRENCY = int(os.getenv("OPENAI_KEY_CONCURRENCY", "32"))
+# Seconds a request waits for a free request slot before failing with a 503
+OPENAI_SLOT_TIMEOUT = float(os.getenv("OPENAI_SLOT_TIMEOUT", "30"))
+# Seconds to cache individual input embeddings for, 0 disables it
+OPENAI_EMBEDDING_CACHE_TTL = int(os.getenv("OPENAI_EMBEDDING_CACHE_TTL", "0"))
+
+
+@functools.lru_cache(maxsize=8)
+def _load_embedding_encoder(model: str) -> tiktoken.Encoding:
+    """Tokenizer for ``model``, raising if it can't be loaded so failures aren't cached"""
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        # Non-OpenAI models: cl100k_base is a close enough approximation
+        return tiktoken.get_encoding("cl100k_base")
+
+
+def _embedding_encoder(model: str) -> tiktoken.Encoding | None:
+    """Tokenizer used to size embedding batches, or None if none can be loaded.
+
+    A failed load, e.g. while the encoding can't be downloaded, is retried
+    by the next request rather than falling back to estimates for good.
+    """
+    try:
+        return _load_embedding_encoder(model)
+    except Exception as e:
+        logger.warning(f"Could not load tiktoken encoder for '{model}', estimating tokens: {e}")
+        return None
+
+
+@functools.lru_cache(maxsize=128)
+def _url(base_url: str, endpoint: str) -> URL:
+    """Parsed request URL, so aiohttp doesn't re-parse the same string per request"""
+    return URL(f"{base_url}/{endpoint}")
+
+
+@functools.lru_cache(maxsize=256)
+def _auth_headers(api_key: str) -> MappingProxyType:
+    """Read-only request headers for ``api_key``, built once per key"""
+    return MappingProxyType(
+        {"Authorization": f"Bearer {api_key}", "Content-Type": "application/json"}
+    )
+
+
+@dataclass
+class _KeySlots:
+    """Request slots of one provider API key and the requests using or awaiting them"""
+    semaphore: asyncio.Semaphore
+    users: int = 0
 
 
 class OpenAIAdapter(ProviderAdapter):
     """Adapter for OpenAI API"""
 
+    # Adapters are created per request, so the pooled session lives on the class.
+    # It is shared by all subclasses and bound to the loop that created it.
+    _session: ClassVar[aiohttp.ClientSession | None] = None
+    _semaphore: ClassVar[asyncio.Semaphore | None] = None
+    # Per-key request slots, keyed by a hash of the API key so it isn't kept in
+    # memory, and dropped once no request uses them
+    _key_slots: ClassVar[dict[str, _KeySlots]] = {}
+    # Current embedding batch token limit per provider and model, shrunk when
+    # the provider rate limits us and grown back on success
+    _embedding_batch_limits: ClassVar[dict[str, int]] = {}
+    # In-flight list_models fetches, keyed like the models cache
+    _models_fetches: ClassVar[dict[str, asyncio.Future]] = {}
+    # In-flight embeddings of individual inputs, keyed like the embedding cache
+    _embedding_fetches: ClassVar[dict[str, asyncio.Future]] = {}
+
     def __init__(
         self,
         provider_name: str,
@@ -30,11 +125,81 @@ class OpenAIAdapter(ProviderAdapter):
     ):
         self._provider_name = provider_name
         self._base_url = base_url
+        # Streaming chunk post-processing, chosen once per adapter
+        self._chunk_transform: Callable[[bytes], bytes] | None = (
+            self.process_streaming_chunk if provider_name == "azure" else None
+        )
 
     @property
     def provider_name(self) -> str:
         return self._provider_name
 
+    @staticmethod
+    async def _get_session() -> aiohttp.ClientSession:
+        """Return the shared HTTP session, with a request semaphore bound to it"""
+        session = await get_http_session()
+        if OpenAIAdapter._session is not session:
+            OpenAIAdapter._session = session
+            OpenAIAdapter._semaphore = asyncio.Semaphore(OPENAI_ADAPTER_CONCURRENCY)
+            OpenAIAdapter._key_slots = {}
+        return session
+
+    @contextlib.asynccontextmanager
+    async def _request_slot(self, api_key: str):
+        """Hold a request slot for ``api_key``, failing with a 503 if none frees up in time.
+
+        The per-key slot is taken before the adapter-wide one, so a burst on one
+        key queues up without holding slots other keys could use. Requires the
+        semaphores bound by ``_get_session``.
+        """
+        key = hashlib.sha256(api_key.encode()).hexdigest()
+        key_slots = OpenAIAdapter._key_slots.get(key)
+        if key_slots is None:
+            key_slots = OpenAIAdapter._key_slots[key] = _KeySlots(
+                asyncio.Semaphore(OPENAI_KEY_CONCURRENCY)
+            )
+        key_slots.users += 1
+        key_semaphore = key_slots.semaphore
+        semaphore = OpenAIAdapter._semaphore
+        try:
+            try:
+                async with asyncio.timeout(OPENAI_SLOT_TIMEOUT):
+                    await key_semaphore.acquire()
+                    try:
+                        await semaphore.acquire()
+                    except BaseException:
+                        key_semaphore.release()
+                        raise
+            except TimeoutError:
+                logger.warning("No free request slot for {} within {}s", self.provider_name, OPENAI_SLOT_TIMEOUT)
+                raise ProviderAPIException(
+                    provider_name=self.provider_name,
+                    error_code=HTTPStatus.SERVICE_UNAVAILABLE,
+                    error_message="Too many concurrent requests, please retry later",
+                )
+            try:
+                yield
+            finally:
+                semaphore.release()
+                key_semaphore.release()
+        finally:
+            key_slots.users -= 1
+            if not key_slots.users and OpenAIAdapter._key_slots.get(key) is key_slots:
+                del OpenAIAdapter._key_slots[key]
+
+    async def _raise_for_status(
+        self, response: aiohttp.ClientResponse, error_label: str
+    ) -> None:
+        """Raise ProviderAPIException if ``response`` is not a 200"""
+        if response.status != HTTPStatus.OK:
+            error_text = await response.text()
+            logger.error("{} error for {}: {}", error_label, self.provider_name, error_text)
+            raise ProviderAPIException(
+                provider_name=self.provider_name,
+                error_code=response.status,
+                error_message=error_text,
+            )
+
     def get_model_id(self, payload: dict[str, Any]) -> str:
         """Get the model ID from the payload"""
         if "id" in payload:
@@ -50,15 +215,16 @@ class OpenAIAdapter(ProviderAdapter):
                 error=ValueError("Model ID not found in payload"),
             )
 
-    def _ensure_list(
-        self, value: str | list[str] | list[int] | list[list[int]]
-    ) -> list[str] | list[int] | list[list[int]]:
-        if not isinstance(value, list):
-            return [value]
-        return value
+    def _estimate_tokens(
+        self, text: str, encoder: tiktoken.Encoding | None = None
+    ) -> int:
+        """Count the tokens in an input, estimating them if there is no tokenizer"""
+        if not isinstance(text, str):
+            # Pre-tokenized input: a list of tokens or a single token
+            return len(text) if isinstance(text, list) else 1
+        if encoder is not None:
+            return len(encoder.encode(text, disallowed_special=()))
 
-    def _estimate_tokens(self, text: str) -> int:
-        """Estimate token count for a text string (rough approximation)"""
         # Rough approximation: 1 token ≈ 4 characters for English text
         # This is a conservative estimate
         estimated = len(text) // 4 + 1
@@ -66,38 +232,66 @@ class OpenAIAdapter(ProviderAdapter):
         # Cap at a reasonable maximum to prevent extremely large batches
         return min(estimated, MAX_TOKENS_PER_BATCH // 2)
 
-    def _create_token_aware_batches(self, inputs: list[str]) -> list[list[str]]:
-        """Create batches based on token count rather than just input count"""
-        batches = []
-        current_batch = []
-        current_token_count = 0
-        
-        for input_text in inputs:
-            estimated_tokens = self._estimate_tokens(input_text)
-            
+    def _embedding_cache_keys(
+        self, api_key: str, base_payload: dict[str, Any], values: list[Any]
+    ) -> list[str]:
+        """Cache key for the embedding of each input under the request's options"""
+        prefix = hashlib.sha256(
+            api_key.encode() + orjson.dumps(base_payload, option=orjson.OPT_SORT_KEYS)
+        )
+        keys = []
+        for value in values:
+            digest = prefix.copy()
+            digest.update(orjson.dumps(value))
+            keys.append(f"{self.provider_name}:{self._base_url}:{digest.hexdigest()}")
+        return keys
+
+    def _count_tokens(
+        self, inputs: list[str], encoder: tiktoken.Encoding | None = None
+    ) -> list[int]:
+        """Token count of every input, tokenizing all text inputs in one call"""
+        if encoder is not None and inputs and all(isinstance(t, str) for t in inputs):
+            return [
+                len(tokens)
+                for tokens in encoder.encode_batch(
+                    inputs, num_threads=min(8, len(inputs)), disallowed_special=()
+                )
+            ]
+        return [self._estimate_tokens(t, encoder) for t in inputs]
+
+    def _create_token_aware_batches(
+        self, token_counts: list[int], max_tokens: int = MAX_TOKENS_PER_BATCH
+    ) -> list[list[int]]:
+        """Group input positions into batches based on token count rather than just input count.
+
+        Inputs are packed first-fit-decreasing, which fills batches tighter than
+        packing them in arrival order. Each batch keeps its positions in input order.
+        """
+        batches: list[list[int]] = []
+        batch_tokens: list[int] = []
+
+        for position in sorted(range(len(token_counts)), key=token_counts.__getitem__, reverse=True):
+            estimated_tokens = token_counts[position]
+
             # If a single input exceeds the limit, it needs to be processed alone
-            if estimated_tokens > MAX_TOKENS_PER_BATCH:
+            if estimated_tokens > max_tokens:
                 logger.warning(f"Single input exceeds token limit ({estimated_tokens} tokens), processing alone")
-                if current_batch:
-                    batches.append(current_batch)
-                batches.append([input_text])
-                current_batch = []
-                current_token_count = 0
+                batches.append([position])
+                batch_tokens.append(max_tokens)
                 continue
-            
-            # If adding this input would exceed the token limit, start a new batch
-            if current_token_count + estimated_tokens > MAX_TOKENS_PER_BATCH and current_batch:
-                batches.append(current_batch)
-                current_batch = [input_text]
-                current_token_count = estimated_tokens
+
+            # Place the input in the first batch with room for it, or start a new one
+            for b, used in enumerate(batch_tokens):
+                if used + estimated_tokens <= max_tokens and len(batches[b]) < MAX_BATCH_SIZE:
+                    batches[b].append(position)
+                    batch_tokens[b] = used + estimated_tokens
+                    break
             else:
-                current_batch.append(input_text)
-                current_token_count += estimated_tokens
-        
-        # Add the last batch if it has content
-        if current_batch:
-            batches.append(current_batch)
-        
+                batches.append([position])
+                batch_tokens.append(estimated_tokens)
+
+        for batch in batches:
+            batch.sort()
         return batches
 
     async def list_models(
@@ -113,43 +307,101 @@ class OpenAIAdapter(ProviderAdapter):
         if cached_models is not None:
             return cached_models
 
-        # If not in cache, make API call
-        headers = {
-            "Authorization": f"Bearer {api_key}",
-            "Content-Type": "application/json",
-        }
-        url = f"{base_url}/models"
+        # On a cache miss, concurrent callers share a single in-flight fetch
+        fetch_key = self._models_cache_key(api_key, base_url)
+        fetch = self._models_fetches.get(fetch_key)
+        if fetch is None:
+            fetch = asyncio.ensure_future(
+                self._fetch_models(api_key, base_url, query_params or {})
+            )
+            self._models_fetches[fetch_key] = fetch
+            fetch.add_done_callback(
+                lambda _: self._models_fetches.pop(fetch_key, None)
+            )
 
-        query_params = query_params or {}
-        async with (
-            aiohttp.ClientSession() as session,
-            session.get(url, headers=headers, params=query_params) as response,
-        ):
-            if response.status != HTTPStatus.OK:
-                error_text = await response.text()
-                logger.error(
-                    f"List Models API error for {self.provider_name}: {error_text}"
-                )
-                raise ProviderAPIException(
-                    provider_name=self.provider_name,
-                    error_code=response.status,
-                    error_message=error_text,
-                )
-            resp = await response.json()
+        # Shield the shared fetch so one cancelled caller doesn't fail the rest
+        models, model_mapping = await asyncio.shield(fetch)
+        if model_mapping is not None:
+            self.OPENAI_MODEL_MAPPING = model_mapping
+        return models
+
+    async def _fetch_models(
+        self, api_key: str, base_url: str, query_params: dict[str, Any]
+    ) -> tuple[list[str], dict[str, str] | None]:
+        """Fetch and cache the models list, returning it with the name mapping.
+
+        If the provider is rate limiting, failing or unreachable and a stale
+        list is known, that list is returned without a mapping instead. Other
+        errors, such as a revoked key, are raised.
+        """
+        headers = _auth_headers(api_key)
+        url = _url(base_url, "models")
+
+        try:
+            session = await self._get_session()
+            async with (
+                self._request_slot(api_key),
+                session.get(url, headers=headers, params=query_params) as response,
+            ):
+                await self._raise_for_status(response, "List Models API")
+                resp = await response.json(loads=orjson.loads, content_type=None)
+        except (ProviderAPIException, aiohttp.ClientError, TimeoutError) as e:
+            # Serve the last known list, if any, while the provider is failing
+            stale_models = self.get_stale_models(api_key, base_url)
+            if stale_models is None or (
+                isinstance(e, ProviderAPIException)
+                and e.error_code != HTTPStatus.TOO_MANY_REQUESTS
+                and e.error_code < HTTPStatus.INTERNAL_SERVER_ERROR
+            ):
+                raise
+            logger.warning(
+                f"List Models API failed for {self.provider_name}, serving stale models"
+            )
+            return stale_models, None
 
-            # Better compatibility with Forge
-            models_list = resp["data"] if isinstance(resp, dict) else resp
+        # Better compatibility with Forge
+        models_list = resp["data"] if isinstance(resp, dict) else resp
 
-            self.OPENAI_MODEL_MAPPING = {
-                d.get("name", self.get_model_id(d)): self.get_model_id(d)
-                for d in models_list
-            }
-            models = [self.get_model_id(d) for d in models_list]
+        # One pass, resolving each model's ID once
+        get_model_id = self.get_model_id
+        model_mapping = {}
+        models = []
+        for d in models_list:
+            model_id = get_model_id(d)
+            models.append(model_id)
+            model_mapping[d.get("name", model_id)] = model_id
 
-            # Cache the results
-            self.cache_models(api_key, self._base_url, models)
+        # Cache the results
+        self.cache_models(api_key, base_url, models)
 
-            return models
+        return models, model_mapping
+
+    async def _stream_response(
+        self,
+        url: URL,
+        api_key: str,
+        payload: dict[str, Any],
+        error_label: str,
+        params: dict[str, Any] | None = None,
+        process: Callable[[bytes], bytes] | None = None,
+    ) -> AsyncGenerator[bytes, None]:
+        """Stream an SSE response back, optionally post-processing each chunk"""
+        headers = _auth_headers(api_key)
+        session = await self._get_session()
+        async with contextlib.AsyncExitStack() as stack:
+            async with self._request_slot(api_key):
+                response = await stack.enter_async_context(
+                    session.post(url, headers=headers, json=payload, params=params)
+                )
+                await self._raise_for_status(response, error_label)
+
+            # The slot only covers getting the response, so long streams don't
+            # starve other requests of slots
+            async for chunk in iter_sse_events(response.content.iter_any()):
+                if process is not None:
+                    chunk = process(chunk)
+                if chunk:
+                    yield chunk
 
     async def process_completion(
         self,
@@ -160,12 +412,9 @@ class OpenAIAdapter(ProviderAdapter):
         query_params: dict[str, Any] = None,
     ) -> Any:
         """Process a completion request using OpenAI API"""
-        headers = {
-            "Authorization": f"Bearer {api_key}",
-            "Content-Type": "application/json",
-        }
+        headers = _auth_headers(api_key)
 
-        url = f"{base_url or self._base_url}/{endpoint}"
+        url = _url(base_url or self._base_url, endpoint)
 
         # Check if streaming is requested
         streaming = payload.get("stream", False)
@@ -173,53 +422,26 @@ class OpenAIAdapter(ProviderAdapter):
         query_params = query_params or {}
         if streaming:
             # For streaming, return a streaming generator
-            async def stream_response() -> AsyncGenerator[bytes, None]:
-                async with (
-                    aiohttp.ClientSession() as session,
-                    session.post(
-                        url, headers=headers, json=payload, params=query_params
-                    ) as response,
-                ):
-                    if response.status != HTTPStatus.OK:
-                        error_text = await response.text()
-                        logger.error(
-                            f"Completion Streaming API error for {self.provider_name}: {error_text}"
-                        )
-                        raise ProviderAPIException(
-                            provider_name=self.provider_name,
-                            error_code=response.status,
-                            error_message=error_text,
-                        )
-
-                    # Stream the response back
-                    async for chunk in response.content:
-                        if self.provider_name == "azure":
-                            chunk = self.process_streaming_chunk(chunk)
-                        if chunk:
-                            yield chunk
-
-            # Return the streaming generator
-            return stream_response()
+            return self._stream_response(
+                url,
+                api_key,
+                payload,
+                "Completion Streaming API",
+                params=query_params,
+                process=self._chunk_transform,
+            )
         else:
             # For non-streaming, use the regular approach
+            session = await self._get_session()
             async with (
-                aiohttp.ClientSession() as session,
+                self._request_slot(api_key),
                 session.post(
                     url, headers=headers, json=payload, params=query_params
                 ) as response,
             ):
-                if response.status != HTTPStatus.OK:
-                    error_text = await response.text()
-                    logger.error(
-                        f"Completion API error for {self.provider_name}: {error_text}"
-                    )
-                    raise ProviderAPIException(
-                        provider_name=self.provider_name,
-                        error_code=response.status,
-                        error_message=error_text,
-                    )
-
-                return await response.json()
+                await self._raise_for_status(response, "Completion API")
+
+                return await response.json(loads=orjson.loads, content_type=None)
 
     async def process_image_generation(
         self,
@@ -228,29 +450,18 @@ class OpenAIAdapter(ProviderAdapter):
         api_key: str,
     ) -> Any:
         """Process an image generation request using OpenAI API"""
-        headers = {
-            "Authorization": f"Bearer {api_key}",
-            "Content-Type": "application/json",
-        }
+        headers = _auth_headers(api_key)
 
-        url = f"{self._base_url}/{endpoint}"
+        url = _url(self._base_url, endpoint)
 
+        session = await self._get_session()
         async with (
-            aiohttp.ClientSession() as session,
+            self._request_slot(api_key),
             session.post(url, headers=headers, json=payload) as response,
         ):
-            if response.status != HTTPStatus.OK:
-                error_text = await response.text()
-                logger.error(
-                    f"Image Generation API error for {self.provider_name}: {error_text}"
-                )
-                raise ProviderAPIException(
-                    provider_name=self.provider_name,
-                    error_code=response.status,
-                    error_message=error_text,
-                )
+            await self._raise_for_status(response, "Image Generation API")
 
-            return await response.json()
+            return await response.json(loads=orjson.loads, content_type=None)
 
     async def process_image_edits(
         self,
@@ -259,27 +470,142 @@ class OpenAIAdapter(ProviderAdapter):
         api_key: str,
     ) -> Any:
         """Process an image edits request using OpenAI API"""
-        headers = {
-            "Authorization": f"Bearer {api_key}",
-            "Content-Type": "application/json",
-        }
+        headers = _auth_headers(api_key)
 
-        url = f"{self._base_url}/{endpoint}"
+        url = _url(self._base_url, endpoint)
 
+        session = await self._get_session()
         async with (
-            aiohttp.ClientSession() as session,
+            self._request_slot(api_key),
             session.post(url, headers=headers, json=payload) as response,
         ):
-            if response.status != HTTPStatus.OK:
-                error_text = await response.text()
-                logger.error(f"API error for {self.provider_name}: {error_text}")
-                raise ProviderAPIException(
-                    provider_name=self.provider_name,
-                    error_code=response.status,
-                    error_message=error_text,
+            await self._raise_for_status(response, "API")
+
+            return await response.json(loads=orjson.loads, content_type=None)
+
+    async def _embed_inputs(
+        self,
+        inputs: list[Any],
+        base_payload: dict[str, Any],
+        url: URL,
+        api_key: str,
+        query_params: dict[str, Any],
+    ) -> tuple[list[dict[str, Any] | None], dict[str, int], str | None]:
+        """Embed ``inputs`` in token-aware batches sent concurrently.
+
+        Returns the embedding of each input (None if the provider left it out),
+        the usage summed over all batches and the model the provider reported.
+        """
+        headers = _auth_headers(api_key)
+        limit_key = f"{self.provider_name}:{base_payload.get('model')}"
+        # Create token-aware batches. The tokenizer is loaded off the event loop
+        # as it may need to be downloaded the first time, and large inputs are
+        # tokenized and packed in the same thread hop so they don't stall other requests
+        model = base_payload.get("model", "")
+        max_tokens = self._embedding_batch_limits.get(limit_key, MAX_TOKENS_PER_BATCH)
+        pre_tokenized = not any(type(value) is str for value in inputs)
+        if len(inputs) >= TOKENIZE_IN_THREAD_MIN_INPUTS or sum(
+            len(value) for value in inputs if isinstance(value, str)
+        ) >= TOKENIZE_IN_THREAD_MIN_CHARS:
+            batches = await asyncio.to_thread(
+                lambda: self._create_token_aware_batches(
+                    self._count_tokens(inputs, None if pre_tokenized else _embedding_encoder(model)),
+                    max_tokens,
                 )
+            )
+        else:
+            # Pre-tokenized inputs already carry their token counts
+            encoder = None if pre_tokenized else await asyncio.to_thread(_embedding_encoder, model)
+            batches = self._create_token_aware_batches(
+                self._count_tokens(inputs, encoder), max_tokens
+            )
 
-            return await response.json()
+        logger.info("Created {} batches for {} inputs", len(batches), len(inputs))
+
+        session = await self._get_session()
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_EMBEDDING_BATCHES)
+        limits = self._embedding_batch_limits
+
+        async def post_batch(batch: list[int]) -> list[tuple[list[int], dict[str, Any]]]:
+            """Embed ``batch``, returning the (positions, response) pairs it was sent as.
+
+            Transient failures are retried with backoff, and a batch the provider
+            rejects as too long is split in half, so one failing batch doesn't
+            discard the others that were already embedded (and billed).
+            """
+            logger.debug("Processing batch with {} inputs", len(batch))
+            batch_payload = {**base_payload, "input": [inputs[k] for k in batch]}
+
+            for attempt in range(EMBED_MAX_RETRIES + 1):
+                try:
+                    async with semaphore:
+                        async with (
+                            self._request_slot(api_key),
+                            session.post(
+                                url, headers=headers, json=batch_payload, params=query_params
+                            ) as response,
+                        ):
+                            if response.status == HTTPStatus.TOO_MANY_REQUESTS:
+                                # Rate limited: halve the batch size for later requests
+                                limits[limit_key] = max(
+                                    MIN_TOKENS_PER_BATCH,
+                                    limits.get(limit_key, MAX_TOKENS_PER_BATCH) // 2,
+                                )
+                            await self._raise_for_status(response, "Embeddings API")
+                            response_json = await response.json(
+                                loads=orjson.loads, content_type=None
+                            )
+                    break
+                except ProviderAPIException as e:
+                    if (
+                        e.error_code == HTTPStatus.BAD_REQUEST
+                        and len(batch) > 1
+                        and "maximum context length" in str(e.error_message)
+                    ):
+                        mid = len(batch) // 2
+                        first, second = await asyncio.gather(
+                            post_batch(batch[:mid]), post_batch(batch[mid:])
+                        )
+                        return first + second
+                    if attempt == EMBED_MAX_RETRIES or not (
+                        e.error_code == HTTPStatus.TOO_MANY_REQUESTS or e.error_code >= 500
+                    ):
+                        raise
+                except (aiohttp.ClientError, TimeoutError):
+                    if attempt == EMBED_MAX_RETRIES:
+                        raise
+                logger.warning(
+                    "Embeddings API batch failed for {}, retrying", self.provider_name
+                )
+                await asyncio.sleep(min(10.0, 0.5 * 2**attempt) * random.uniform(0.5, 1.5))
+
+            if limit_key in limits:
+                # Grow back towards the full batch size while requests succeed
+                limit = limits[limit_key] + BATCH_TOKENS_INCREASE
+                if limit >= MAX_TOKENS_PER_BATCH:
+                    del limits[limit_key]
+                else:
+                    limits[limit_key] = limit
+            return [(batch, response_json)]
+
+        # Batches are independent, so send them concurrently
+        results = await asyncio.gather(*(post_batch(batch) for batch in batches))
+
+        embeddings: list[dict[str, Any] | None] = [None] * len(inputs)
+        usage_total = {"prompt_tokens": 0, "total_tokens": 0}
+        model_name = None
+        for batch, response_json in chain.from_iterable(results):
+            # Indices in each response are relative to its own batch
+            for j, item in enumerate(response_json["data"]):
+                embeddings[batch[item.get("index", j)]] = item
+
+            # Accumulate usage statistics and the model name across batches
+            usage = response_json.get("usage") or {}
+            usage_total["prompt_tokens"] += usage.get("prompt_tokens") or 0
+            usage_total["total_tokens"] += usage.get("total_tokens") or 0
+            if model_name is None:
+                model_name = response_json.get("model")
+        return embeddings, usage_total, model_name
 
     async def process_embeddings(
         self,
@@ -291,64 +617,130 @@ class OpenAIAdapter(ProviderAdapter):
     ) -> Any:
         # https://platform.openai.com/docs/api-reference/embeddings/create
         """Process a embeddings request using OpenAI API"""
-        headers = {
-            "Authorization": f"Bearer {api_key}",
-            "Content-Type": "application/json",
-        }
-
-        # process single and batch jobs
-        payload["input"] = self._ensure_list(payload["input"])
+        # process single and batch jobs; a flat list of token ids is a single input
+        value = payload["input"]
+        if type(value) is not list or (value and type(value[0]) is int):
+            payload["input"] = [value]
 
         # inpput_type is for cohere embeddings only
         if "input_type" in payload:
             del payload["input_type"]
 
-        url = f"{base_url or self._base_url}/{endpoint}"
+        url = _url(base_url or self._base_url, endpoint)
         query_params = query_params or {}
 
-        all_embeddings = []
-        total_usage = {"prompt_tokens": 0, "total_tokens": 0}
-        
-        # Create token-aware batches
-        batches = self._create_token_aware_batches(payload["input"])
-        
-        logger.info(f"Created {len(batches)} batches for {len(payload['input'])} inputs")
-        
-        for i, batch_inputs in enumerate(batches):
-            logger.debug(f"Processing batch {i+1}/{len(batches)} with {len(batch_inputs)} inputs")
-            batch_payload = payload.copy()
-            batch_payload["input"] = batch_inputs
+        # Send each distinct input upstream once; duplicates are filled in below
+        inputs = payload["input"]
+        unique_inputs = []
+        inverse = []
+        positions: dict[Any, int] = {}
+        for value in inputs:
+            key = tuple(value) if isinstance(value, list) else value
+            position = positions.get(key)
+            if position is None:
+                position = positions[key] = len(unique_inputs)
+                unique_inputs.append(value)
+            inverse.append(position)
+        if len(unique_inputs) < len(inputs):
+            logger.debug(
+                "Deduplicated {} embedding inputs to {}", len(inputs), len(unique_inputs)
+            )
 
-            async with (
-                aiohttp.ClientSession() as session,
-                session.post(
-                    url, headers=headers, json=batch_payload, params=query_params
-                ) as response,
-            ):
-                if response.status != HTTPStatus.OK:
-                    error_text = await response.text()
-                    logger.error(
-                        f"Embeddings API error for {self.provider_name}: {error_text}"
-                    )
-                    raise ProviderAPIException(
-                        provider_name=self.provider_name,
-                        error_code=response.status,
-                        error_message=error_text,
-                    )
-
-                response_json = await response.json()
-                all_embeddings.extend(response_json["data"])
-                
-                # Accumulate usage statistics
-                if "usage" in response_json:
-                    total_usage["prompt_tokens"] += response_json["usage"].get("prompt_tokens", 0)
-                    total_usage["total_tokens"] += response_json["usage"].get("total_tokens", 0)
+        # Only the input differs between batches
+        base_payload = {k: v for k, v in payload.items() if k != "input"}
+
+        # Reuse cached embeddings and only send the misses upstream
+        embeddings: list[dict[str, Any] | None] = [None] * len(unique_inputs)
+        cache_keys = self._embedding_cache_keys(api_key, base_payload, unique_inputs)
+        if OPENAI_EMBEDDING_CACHE_TTL > 0:
+            embeddings = await get_cached_embeddings_async(cache_keys)
+
+        # Misses another request is already embedding are awaited rather than
+        # sent again; the rest are registered as in flight for this request
+        fetches = self._embedding_fetches
+        loop = asyncio.get_running_loop()
+        misses = []
+        waiting: dict[int, asyncio.Future] = {}
+        for k, item in enumerate(embeddings):
+            if item is not None:
+                continue
+            fetch = fetches.get(cache_keys[k])
+            if fetch is None:
+                fetch = fetches[cache_keys[k]] = loop.create_future()
+                # Mark failures as retrieved in case nobody else awaits them
+                fetch.add_done_callback(lambda f: f.cancelled() or f.exception())
+                misses.append(k)
+            else:
+                waiting[k] = fetch
+
+        try:
+            embedded, total_usage, model_name = (
+                await self._embed_inputs(
+                    [unique_inputs[k] for k in misses], base_payload, url, api_key, query_params
+                )
+                if misses
+                else ([], {"prompt_tokens": 0, "total_tokens": 0}, None)
+            )
+        except BaseException as e:
+            for k in misses:
+                fetch = fetches.pop(cache_keys[k])
+                if fetch.done():
+                    continue
+                # If this request was cancelled, its waiters embed the inputs themselves
+                if isinstance(e, Exception):
+                    fetch.set_exception(e)
+                else:
+                    fetch.cancel()
+            raise
+        for k, item in zip(misses, embedded):
+            embeddings[k] = item
+            fetches.pop(cache_keys[k]).set_result(item)
+
+        if waiting:
+            # Wait without propagating cancellation either way: a cancelled caller
+            # leaves the shared fetches running, and fetches whose owner was
+            # cancelled are embedded by this request instead
+            await asyncio.wait(waiting.values())
+            orphans = []
+            for k, fetch in waiting.items():
+                if fetch.cancelled():
+                    orphans.append(k)
+                else:
+                    embeddings[k] = fetch.result()
+            if orphans:
+                logger.debug("Embedding {} inputs of a cancelled request", len(orphans))
+                embedded, usage, orphan_model = await self._embed_inputs(
+                    [unique_inputs[k] for k in orphans], base_payload, url, api_key, query_params
+                )
+                for k, item in zip(orphans, embedded):
+                    embeddings[k] = item
+                total_usage["prompt_tokens"] += usage["prompt_tokens"]
+                total_usage["total_tokens"] += usage["total_tokens"]
+                model_name = model_name or orphan_model
+                misses.extend(orphans)
+
+        if OPENAI_EMBEDDING_CACHE_TTL > 0 and misses:
+            await cache_embeddings_async(
+                {
+                    cache_keys[k]: embeddings[k]
+                    for k in misses
+                    if embeddings[k] is not None
+                },
+                ttl=OPENAI_EMBEDDING_CACHE_TTL,
+            )
+
+        # Expand back to one embedding per original input, in input order
+        all_embeddings = [
+            {**embeddings[position], "index": i}
+            for i, position in enumerate(inverse)
+            if embeddings[position] is not None
+        ]
 
         # Combine the results into a single response
         final_response = {
             "object": "list",
             "data": all_embeddings,
-            "model": response_json["model"],
+            "model": model_name or payload.get("model"),
             "usage": total_usage,
         }
         return final_response
@@ -361,59 +753,24 @@ class OpenAIAdapter(ProviderAdapter):
         base_url: str | None = None,
     ) -> Any:
         """Process a response request using OpenAI API"""
-        headers = {
-            "Authorization": f"Bearer {api_key}",
-            "Content-Type": "application/json",
-        }
+        headers = _auth_headers(api_key)
 
-        url = f"{base_url or self._base_url}/{endpoint}"
+        url = _url(base_url or self._base_url, endpoint)
 
         # Check if streaming is requested
         streaming = payload.get("stream", False)
         if streaming:
             # For streaming, return a streaming generator
-            async def stream_response() -> AsyncGenerator[bytes, None]:
-                async with (
-                    aiohttp.ClientSession() as session,
-                    session.post(
-                        url, headers=headers, json=payload
-                    ) as response,
-                ):
-                    if response.status != HTTPStatus.OK:
-                        error_text = await response.text()
-                        logger.error(
-                            f"Responses Streaming API error for {self.provider_name}: {error_text}"
-                        )
-                        raise ProviderAPIException(
-                            provider_name=self.provider_name,
-                            error_code=response.status,
-                            error_message=error_text,
-                        )
-
-                    # Stream the response back
-                    async for chunk in response.content:
-                        if chunk:
-                            yield chunk
-
-            # Return the streaming generator
-            return stream_response()
+            return self._stream_response(
+                url, api_key, payload, "Responses Streaming API"
+            )
         else:
             # For non-streaming, use the regular approach
+            session = await self._get_session()
             async with (
-                aiohttp.ClientSession() as session,
-                session.post(
-                    url, headers=headers, json=payload
-                ) as response,
+                self._request_slot(api_key),
+                session.post(url, headers=headers, json=payload) as response,
             ):
-                if response.status != HTTPStatus.OK:
-                    error_text = await response.text()
-                    logger.error(
-                        f"Responses API error for {self.provider_name}: {error_text}"
-                    )
-                    raise ProviderAPIException(
-                        provider_name=self.provider_name,
-                        error_code=response.status,
-                        error_message=error_text,
-                    )
-
-                return await response.json()
+                await self._raise_for_status(response, "Responses API")
+
+                return await response.json(loads=orjson.loads, content_type=None)
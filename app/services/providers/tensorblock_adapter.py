@@ -2,7 +2,7 @@ from typing import Any
 
 from .azure_adapter import AzureAdapter
 
-TENSORBLOCK_MODELS = [
+TENSORBLOCK_MODELS = (
     "gpt-4.1-mini",
     "gpt-4.1-nano",
     "gpt-4o-mini",
@@ -10,7 +10,7 @@ TENSORBLOCK_MODELS = [
     "text-embedding-3-large",
     "text-embedding-3-small",
     "text-embedding-ada-002",
-]
+)
 
 
 class TensorblockAdapter(AzureAdapter):
@@ -25,4 +25,4 @@ class TensorblockAdapter(AzureAdapter):
         return model
 
     async def list_models(self, api_key: str) -> list[str]:
-        return TENSORBLOCK_MODELS
+        return list(TENSORBLOCK_MODELS)
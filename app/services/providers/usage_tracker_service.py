@@ -1,21 +1,260 @@
+import asyncio
+import os
+from dataclasses import dataclass
 from datetime import UTC
 from datetime import datetime
-from sqlalchemy import delete
+from decimal import Decimal
+from typing import Any, ClassVar
+from sqlalchemy import delete, insert, update
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.exc import NoResultFound
-from sqlalchemy.orm import selectinload
 from sqlalchemy import select
 import uuid
 
+from app.core.database import get_db_session
 from app.core.logger import get_logger
+from app.models.provider_key import ProviderKey
 from app.models.usage_tracker import UsageTracker
 from app.services.pricing_service import PricingService
 from app.services.wallet_service import WalletService
 
 logger = get_logger(name="usage_tracker")
 
+# Maximum number of queued usage writes handled with one database session
+USAGE_WRITE_BATCH_SIZE = 100
+# Maximum number of usage writes waiting for the background writer; once it is
+# full, requests write their usage themselves
+USAGE_WRITE_QUEUE_SIZE = int(os.getenv("USAGE_WRITE_QUEUE_SIZE", "10000"))
+# Seconds flush() waits for queued usage writes before giving up on them
+USAGE_FLUSH_TIMEOUT = float(os.getenv("USAGE_FLUSH_TIMEOUT", "30"))
+
+
+@dataclass
+class WalletCharge:
+    """Amount to deduct from a user's wallet for tracked usage"""
+    user_id: int
+    endpoint: str
+    currency: str
+    amount: Decimal
+
+
 class UsageTrackerService:
     """Service for tracking usage of providers and forge API keys."""
+
+    # Usage writes queued by request handlers, applied in order by a background writer
+    _write_queue: ClassVar[asyncio.Queue | None] = None
+    _writer_task: ClassVar[asyncio.Task | None] = None
+    # Ids of records whose queued insert the writer hasn't applied yet
+    _pending_starts: ClassVar[set[uuid.UUID]] = set()
+    # Writes applied by requests themselves while the queue was full
+    _direct_writes: ClassVar[set[asyncio.Task]] = set()
+
+    @classmethod
+    async def _enqueue(cls, operation: str, values: dict[str, Any]) -> None:
+        """Queue a usage write, starting the background writer on first use.
+
+        When the queue is full, the write is applied in the caller's request
+        instead, which slows requests down to what the database keeps up with.
+        Updates of a record whose insert is still queued wait for a queue slot
+        so they can't overtake it.
+        """
+        loop = asyncio.get_running_loop()
+        if cls._writer_task is None or cls._writer_task.done() or cls._writer_task.get_loop() is not loop:
+            cls._write_queue = asyncio.Queue(maxsize=USAGE_WRITE_QUEUE_SIZE)
+            cls._writer_task = loop.create_task(cls._write_queued_usage(cls._write_queue))
+            cls._pending_starts = set()
+            cls._direct_writes = set()
+        queue = cls._write_queue
+        try:
+            queue.put_nowait((operation, values))
+            if operation == "start":
+                cls._pending_starts.add(values["id"])
+            return
+        except asyncio.QueueFull:
+            pass
+
+        logger.warning("Usage write queue is full, writing usage in the request")
+        if operation != "start" and values["usage_tracker_id"] in cls._pending_starts:
+            await queue.put((operation, values))
+            return
+        # Shielded so a cancelled request can't drop its usage write
+        write = loop.create_task(cls._write_usage(operation, values))
+        cls._direct_writes.add(write)
+        write.add_done_callback(cls._direct_writes.discard)
+        await asyncio.shield(write)
+
+    @classmethod
+    async def _write_usage(cls, operation: str, values: dict[str, Any]) -> None:
+        """Apply a single usage write with its own database session"""
+        try:
+            async with get_db_session() as db:
+                if operation == "start":
+                    await cls._insert_usage_trackers(db, [values])
+                elif operation == "update":
+                    await cls.update_usage_tracker(db, **values)
+                else:
+                    await cls.delete_usage_tracker_record(db, **values)
+        except Exception as e:
+            logger.exception(f"Failed to write usage: {e}")
+
+    @classmethod
+    async def _write_queued_usage(cls, queue: asyncio.Queue) -> None:
+        """Apply queued usage writes in order, inserting consecutive new records together"""
+        while True:
+            writes = [await queue.get()]
+            while len(writes) < USAGE_WRITE_BATCH_SIZE and not queue.empty():
+                writes.append(queue.get_nowait())
+
+            try:
+                async with get_db_session() as db:
+                    inserts = []
+                    # Wallet charges of the batch, summed per user so each wallet
+                    # row is updated once per batch however many requests it paid for
+                    charges: dict[tuple[int, str, str], Decimal] = {}
+                    for operation, values in writes:
+                        if operation == "start":
+                            inserts.append(values)
+                            continue
+                        if inserts:
+                            await cls._insert_usage_trackers(db, inserts)
+                            inserts = []
+                        if operation == "update":
+                            charge = await cls.update_usage_tracker(
+                                db, **values, charge_wallet=False
+                            )
+                            if charge is not None:
+                                key = (charge.user_id, charge.endpoint, charge.currency)
+                                charges[key] = charges.get(key, Decimal(0)) + charge.amount
+                        else:
+                            await cls.delete_usage_tracker_record(db, **values)
+                    if inserts:
+                        await cls._insert_usage_trackers(db, inserts)
+                    for (user_id, endpoint, currency), amount in charges.items():
+                        await cls._charge_wallet(
+                            db, WalletCharge(user_id, endpoint, currency, amount)
+                        )
+            except Exception as e:
+                logger.exception(f"Failed to write queued usage: {e}")
+            finally:
+                for operation, values in writes:
+                    if operation == "start":
+                        cls._pending_starts.discard(values["id"])
+                    queue.task_done()
+
+    @staticmethod
+    async def _insert_usage_trackers(db: AsyncSession, rows: list[dict[str, Any]]) -> None:
+        """Insert new usage tracker records, one by one if inserting them together fails.
+
+        A bad row must not cost the rest of the batch their records, or the
+        updates queued behind them would find nothing to update and go unbilled.
+        """
+        try:
+            await db.execute(insert(UsageTracker), rows)
+            await db.commit()
+            logger.debug("Started tracking usage for {} requests", len(rows))
+            return
+        except Exception as e:
+            await db.rollback()
+            if len(rows) == 1:
+                logger.error(f"Failed to track usage: {e}")
+                return
+            logger.warning(f"Failed to track usage for {len(rows)} requests together, inserting them one by one: {e}")
+
+        for row in rows:
+            try:
+                await db.execute(insert(UsageTracker), [row])
+                await db.commit()
+            except Exception as e:
+                await db.rollback()
+                logger.error(f"Failed to track usage {row['id']}: {e}")
+
+    @classmethod
+    async def queue_start_tracking_usage(
+        cls,
+        user_id: int,
+        provider_key_id: int,
+        forge_key_id: int,
+        model: str,
+        endpoint: str,
+        billable: bool = False,
+    ) -> uuid.UUID:
+        """Queue the creation of a usage tracker record and return its id.
+
+        The record is written by the background writer, so the request doesn't
+        wait for the commit; later queued updates for it are applied after it.
+        """
+        usage_tracker_id = uuid.uuid4()
+        await cls._enqueue(
+            "start",
+            {
+                "id": usage_tracker_id,
+                "user_id": user_id,
+                "provider_key_id": provider_key_id,
+                "forge_key_id": forge_key_id,
+                "model": model,
+                "endpoint": endpoint,
+                "created_at": datetime.now(UTC),
+                "billable": billable,
+            },
+        )
+        return usage_tracker_id
+
+    @classmethod
+    async def queue_update_usage_tracker(
+        cls,
+        usage_tracker_id: uuid.UUID,
+        input_tokens: int,
+        output_tokens: int,
+        cached_tokens: int,
+        reasoning_tokens: int,
+        provider_name: str | None = None,
+        model: str | None = None,
+    ) -> None:
+        """Queue an update_usage_tracker call for the background writer"""
+        if usage_tracker_id is None:
+            return
+        await cls._enqueue(
+            "update",
+            {
+                "usage_tracker_id": usage_tracker_id,
+                "input_tokens": input_tokens,
+                "output_tokens": output_tokens,
+                "cached_tokens": cached_tokens,
+                "reasoning_tokens": reasoning_tokens,
+                "provider_name": provider_name,
+                "model": model,
+            },
+        )
+
+    @classmethod
+    async def queue_delete_usage_tracker_record(cls, usage_tracker_id: uuid.UUID) -> None:
+        """Queue a delete_usage_tracker_record call for the background writer"""
+        if usage_tracker_id is None:
+            return
+        await cls._enqueue("delete", {"usage_tracker_id": usage_tracker_id})
+
+    @classmethod
+    async def flush(cls) -> None:
+        """Wait for queued usage writes and stop the writer, e.g. on application shutdown.
+
+        Gives up after USAGE_FLUSH_TIMEOUT seconds, logging how many writes are lost.
+        """
+        if cls._writer_task is None:
+            return
+        if not cls._writer_task.done() and cls._writer_task.get_loop() is asyncio.get_running_loop():
+            try:
+                await asyncio.wait_for(
+                    asyncio.gather(cls._write_queue.join(), *cls._direct_writes),
+                    USAGE_FLUSH_TIMEOUT,
+                )
+            except TimeoutError:
+                logger.error(f"Timed out flushing usage writes, {cls._write_queue.qsize()} queued writes were not applied")
+            finally:
+                cls._writer_task.cancel()
+        cls._writer_task = None
+        cls._write_queue = None
+        cls._pending_starts = set()
+        cls._direct_writes = set()
+
     @staticmethod
     async def start_tracking_usage(
         db: AsyncSession,
@@ -53,58 +292,103 @@ class UsageTrackerService:
         output_tokens: int,
         cached_tokens: int,
         reasoning_tokens: int,
-    ) -> None:
+        provider_name: str | None = None,
+        model: str | None = None,
+        charge_wallet: bool = True,
+    ) -> WalletCharge | None:
+        """Record the token usage and cost of a tracked request and bill it.
+
+        Callers that know the request's ``provider_name`` and ``model`` should
+        pass them already lowercased, which saves looking them up and
+        normalising them before pricing the usage.
+
+        The wallet is charged after the usage is committed, so a wallet conflict
+        can't roll the usage back. The charge is returned; with ``charge_wallet``
+        False it is left for the caller to apply.
+        """
         if usage_tracker_id is None:
-            return
+            return None
 
         try:
-            result = await db.execute(
-                select(UsageTracker)
-                .options(selectinload(UsageTracker.provider_key))
-                .filter(UsageTracker.id == usage_tracker_id)
-            )
-            usage_tracker = result.scalar_one_or_none()
+            if provider_name is None or model is None:
+                result = await db.execute(
+                    select(ProviderKey.provider_name, UsageTracker.model)
+                    .join(UsageTracker.provider_key)
+                    .where(UsageTracker.id == usage_tracker_id)
+                )
+                row = result.one_or_none()
+                if row is None:
+                    logger.error(f"Usage tracker not found: {usage_tracker_id}")
+                    return None
+                provider_name, model = row.provider_name.lower(), row.model.lower()
+
             now = datetime.now(UTC)
             price_info = await PricingService.calculate_usage_cost(
                 db,
-                usage_tracker.provider_key.provider_name.lower(),
-                usage_tracker.model.lower(),
+                provider_name,
+                model,
                 input_tokens,
                 output_tokens,
                 cached_tokens,
                 now,
             )
-            usage_tracker.input_tokens = input_tokens
-            usage_tracker.output_tokens = output_tokens
-            usage_tracker.cached_tokens = cached_tokens
-            usage_tracker.reasoning_tokens = reasoning_tokens
-            usage_tracker.updated_at = now
-            usage_tracker.cost = price_info['total_cost']
-            usage_tracker.currency = price_info['currency']
-            usage_tracker.pricing_source = price_info['pricing_source']
-            
-            # Deduct from wallet balance if the provider is not free
-            if price_info['total_cost'] and price_info['total_cost'] > 0 and usage_tracker.billable:
-                try:
-                    result = await WalletService.adjust(
-                        db, 
-                        usage_tracker.user_id, 
-                        -price_info['total_cost'], 
-                        f"usage:{usage_tracker.endpoint}",
-                        price_info['currency']
-                    )
-                    if not result.get("success"):
-                        logger.warning(f"Failed to deduct from wallet for user {usage_tracker.user_id}: {result.get('reason')}")
-                except Exception as wallet_err:
-                    logger.exception(f"Wallet deduction failed for user {usage_tracker.user_id}: {wallet_err}")
-            
+            # Update the row in place, reading back only what billing needs
+            result = await db.execute(
+                update(UsageTracker)
+                .where(UsageTracker.id == usage_tracker_id)
+                .values(
+                    input_tokens=input_tokens,
+                    output_tokens=output_tokens,
+                    cached_tokens=cached_tokens,
+                    reasoning_tokens=reasoning_tokens,
+                    updated_at=now,
+                    cost=price_info['total_cost'],
+                    currency=price_info['currency'],
+                    pricing_source=price_info['pricing_source'],
+                )
+                .returning(UsageTracker.user_id, UsageTracker.endpoint, UsageTracker.billable)
+            )
+            usage_tracker = result.one_or_none()
+            if usage_tracker is None:
+                await db.rollback()
+                logger.error(f"Usage tracker not found: {usage_tracker_id}")
+                return None
+
             await db.commit()
             logger.debug(f"Updated usage tracker {usage_tracker_id} with input_tokens {input_tokens}, output_tokens {output_tokens}, cached_tokens {cached_tokens}, reasoning_tokens {reasoning_tokens}")
-        except NoResultFound:
-            logger.error(f"Usage tracker not found: {usage_tracker_id}")
         except Exception as e:
             await db.rollback()
             logger.exception(f"Failed to update usage tracker: {e}")
+            return None
+
+        # Deduct from wallet balance if the provider is not free
+        if not (price_info['total_cost'] and price_info['total_cost'] > 0 and usage_tracker.billable):
+            return None
+        charge = WalletCharge(
+            usage_tracker.user_id,
+            usage_tracker.endpoint,
+            price_info['currency'],
+            price_info['total_cost'],
+        )
+        if charge_wallet:
+            await UsageTrackerService._charge_wallet(db, charge)
+        return charge
+
+    @staticmethod
+    async def _charge_wallet(db: AsyncSession, charge: WalletCharge) -> None:
+        """Deduct a usage charge from the user's wallet, logging failures for reconciliation"""
+        try:
+            result = await WalletService.adjust(
+                db,
+                charge.user_id,
+                -charge.amount,
+                f"usage:{charge.endpoint}",
+                charge.currency,
+            )
+            if not result.get("success"):
+                logger.warning(f"Failed to deduct {charge.amount} {charge.currency} from wallet for user {charge.user_id}: {result.get('reason')}")
+        except Exception as wallet_err:
+            logger.exception(f"Wallet deduction of {charge.amount} {charge.currency} failed for user {charge.user_id}: {wallet_err}")
 
     @staticmethod
     async def delete_usage_tracker_record(
@@ -1,16 +1,22 @@
 import asyncio
+import copy
+import hashlib
 import json
+import os
 import time
 import uuid
+from collections import OrderedDict
 from collections.abc import AsyncGenerator
-from datetime import datetime, timezone
-from typing import Any
-import aiohttp
+from datetime import UTC
+from typing import Any, ClassVar, Literal
+import orjson
 from google.oauth2 import service_account
+from pydantic import BaseModel, ConfigDict
 from google.auth.transport.requests import Request
 from app.exceptions.exceptions import ProviderAuthenticationException, InvalidProviderConfigException, InvalidProviderAPIKeyException, ProviderAPIException
 
 from app.core.async_cache import get_cached_oauth_token_async, cache_oauth_token_async, invalidate_oauth_token_cache_async
+from app.core.http_client import get_http_session
 from app.core.logger import get_logger
 
 from .base import ProviderAdapter
@@ -18,10 +24,45 @@ from .anthropic_adapter import AnthropicAdapter
 
 logger = get_logger(name="vertex_adapter")
 
+VERTEX_SCOPE = "https://www.googleapis.com/auth/cloud-platform"
+
+# Number of converted completion payloads kept for identical repeat requests, 0 (the default) disables it
+VERTEX_PAYLOAD_CACHE_SIZE = int(os.getenv("VERTEX_PAYLOAD_CACHE_SIZE", "0"))
+# Payloads serialising to more than this many bytes are converted without caching
+VERTEX_PAYLOAD_CACHE_MAX_BYTES = 64 * 1024
+
+
+class ServiceAccountKey(BaseModel):
+    """Fields a Vertex service-account key must provide"""
+
+    model_config = ConfigDict(extra="allow")
+
+    type: Literal["service_account"]
+    project_id: str
+    private_key_id: str
+    private_key: str
+    client_email: str
+    client_id: str
+    auth_uri: str
+    token_uri: str
+    auth_provider_x509_cert_url: str
+    client_x509_cert_url: str
+    universe_domain: str
+
 
 class VertexAdapter(ProviderAdapter):
     """Adapter for Vertex AI API"""
 
+    # Class-level LRU cache of parsed service-account keys and their credentials,
+    # keyed by a hash of the key; building credentials parses the PEM private key
+    _credentials_cache: ClassVar[OrderedDict[str, tuple[dict[str, Any], service_account.Credentials]]] = OrderedDict()
+    _credentials_cache_max_size: ClassVar[int] = 128
+    # Class-level LRU cache of Anthropic payloads converted from OpenAI ones,
+    # keyed by a hash of the serialised OpenAI payload
+    _payload_cache: ClassVar[OrderedDict[bytes, dict[str, Any]]] = OrderedDict()
+    # In-flight OAuth token refreshes, keyed like the credentials cache
+    _token_refreshes: ClassVar[dict[str, asyncio.Future]] = {}
+
     def __init__(self, provider_name: str, base_url: str | None = None, config: dict[str, str] | None = None):
         self._provider_name = provider_name
         self._base_url = base_url.rstrip("/") if base_url else None
@@ -59,34 +100,48 @@ class VertexAdapter(ProviderAdapter):
             self._base_url = "https://aiplatform.googleapis.com"
         else:
             self._base_url = f"https://{self.location}-aiplatform.googleapis.com"
+
+        # URL parts fixed by the config, built once instead of per request
+        self._models_url = f"{self._base_url}/v1beta1/publishers/{self.publisher}/models"
+        self._models_path = f"locations/{self.location}/publishers/{self.publisher}/models"
     
     @staticmethod
     def validate_api_key(api_key: str):
         """Validate the API key for the given provider"""
         try:
-            cred_json = json.loads(api_key)
-            assert cred_json["type"] == "service_account"
-            assert cred_json["project_id"] is not None
-            assert cred_json["private_key_id"] is not None
-            assert cred_json["private_key"] is not None
-            assert cred_json["client_email"] is not None
-            assert cred_json["client_id"] is not None
-            assert cred_json["auth_uri"] is not None
-            assert cred_json["token_uri"] is not None
-            assert cred_json["auth_provider_x509_cert_url"] is not None
-            assert cred_json["client_x509_cert_url"] is not None
-            assert cred_json["universe_domain"] is not None
-
-            return cred_json
+            # Parse and check the key in one pass
+            return ServiceAccountKey.model_validate_json(api_key).model_dump()
         except Exception as e:
             raise InvalidProviderAPIKeyException("Vertex", e)
     
+    @staticmethod
+    def _credentials_cache_key(api_key: str) -> str:
+        """Cache key for a service-account key, hashing it so it isn't kept in memory"""
+        return hashlib.sha256(api_key.encode()).hexdigest()
+
+    @classmethod
+    def _load_credentials(cls, api_key: str) -> tuple[dict[str, Any], service_account.Credentials]:
+        """Parse the service-account key and build its credentials, once per key"""
+        key = cls._credentials_cache_key(api_key)
+        cached = cls._credentials_cache.get(key)
+        if cached is not None:
+            cls._credentials_cache.move_to_end(key)
+            return cached
+
+        cred_json = cls.validate_api_key(api_key)
+        credentials = service_account.Credentials.from_service_account_info(cred_json, scopes=[VERTEX_SCOPE])
+        cls._credentials_cache[key] = (cred_json, credentials)
+        if len(cls._credentials_cache) > cls._credentials_cache_max_size:
+            cls._credentials_cache.popitem(last=False)
+        return cred_json, credentials
+
     def parse_api_key(self, api_key: str):
         """Validate the API key for the given provider"""
         try:
-            cred_json = self.validate_api_key(api_key)
+            cred_json, credentials = self._load_credentials(api_key)
             self.project_id = cred_json["project_id"]
             self.cred_json = cred_json
+            self.credentials = credentials
         except Exception as e:
             raise ProviderAuthenticationException("Vertex", e)
     
@@ -104,7 +159,7 @@ class VertexAdapter(ProviderAdapter):
     @staticmethod
     def deserialize_api_key_config(serialized_api_key_config: str) -> tuple[str, dict[str, Any] | None]:
         """Deserialize the API key for the given provider"""
-        deserialized_api_key_config = json.loads(serialized_api_key_config)
+        deserialized_api_key_config = orjson.loads(serialized_api_key_config)
         return deserialized_api_key_config["api_key"], {
             "publisher": deserialized_api_key_config["publisher"],
             "location": deserialized_api_key_config["location"],
@@ -138,20 +193,40 @@ class VertexAdapter(ProviderAdapter):
         })
     
     async def vertex_authentication(self, api_key: str) -> str:
-        # validate api key
-        self.parse_api_key(api_key)
-
-        # check cache first for existing valid token
+        # check cache first for existing valid token, which also records the
+        # project so the key only needs parsing to refresh the token
         cached_token = await get_cached_oauth_token_async(api_key)
         if cached_token:
             access_token = cached_token.get("access_token")
-            if access_token:
+            project_id = cached_token.get("project_id")
+            if access_token and project_id:
+                self.project_id = project_id
                 return access_token
 
-        # load credentials within scope
-        try:
-            credentials = service_account.Credentials.from_service_account_info(self.cred_json, scopes=["https://www.googleapis.com/auth/cloud-platform"])
+        # validate api key
+        self.parse_api_key(api_key)
 
+        # On a cache miss, concurrent callers share a single token refresh
+        refresh_key = self._credentials_cache_key(api_key)
+        refresh = self._token_refreshes.get(refresh_key)
+        if refresh is None:
+            refresh = asyncio.ensure_future(
+                self._refresh_token(api_key, self.credentials, self.project_id)
+            )
+            self._token_refreshes[refresh_key] = refresh
+            refresh.add_done_callback(
+                lambda _: self._token_refreshes.pop(refresh_key, None)
+            )
+
+        # Shield the shared refresh so one cancelled caller doesn't fail the rest
+        return await asyncio.shield(refresh)
+
+    @classmethod
+    async def _refresh_token(
+        cls, api_key: str, credentials: service_account.Credentials, project_id: str
+    ) -> str:
+        """Refresh the OAuth token for a service-account key and cache it"""
+        try:
             # refresh token - run in thread pool to avoid blocking
             await asyncio.to_thread(credentials.refresh, Request())
             
@@ -159,13 +234,16 @@ class VertexAdapter(ProviderAdapter):
             if credentials.token and credentials.expiry:
                 # Add 5-minute safety buffer to prevent using tokens too close to expiry
                 safety_buffer_seconds = 5 * 60  # 5 minutes
-                expires_at_with_buffer = credentials.expiry.timestamp() - safety_buffer_seconds
+                # google-auth returns expiry as a naive datetime in UTC; without
+                # tzinfo, timestamp() would read it as local time and shift it
+                expires_at_with_buffer = credentials.expiry.replace(tzinfo=UTC).timestamp() - safety_buffer_seconds
                 
                 token_data = {
                     "access_token": credentials.token,
                     "token_type": "Bearer",
                     "expires_at": expires_at_with_buffer,  # Unix timestamp with safety buffer
-                    "scope": "https://www.googleapis.com/auth/cloud-platform",
+                    "scope": VERTEX_SCOPE,
+                    "project_id": project_id,
                     "cached_at": time.time(),  # For debugging
                     "provider": "vertex"  # Helpful for multi-provider systems
                 }
@@ -174,6 +252,8 @@ class VertexAdapter(ProviderAdapter):
             return credentials.token
         except Exception as e:
             logger.error(f"Error authenticating with Vertex API: {e}")
+            # Rebuild the credentials from the key next time rather than reuse a failed one
+            cls._credentials_cache.pop(cls._credentials_cache_key(api_key), None)
             raise ProviderAuthenticationException("Vertex", e)
 
     async def list_models(self, api_key: str) -> list[str]:
@@ -188,26 +268,65 @@ class VertexAdapter(ProviderAdapter):
             "Authorization": f"Bearer {token}",
             "Content-Type": "application/json",
         }
-        url = f"{self._base_url}/v1beta1/publishers/{self.publisher}/models"
+        url = self._models_url
         models = []
-        async with aiohttp.ClientSession() as session:
-            next_page_token = "###initial"
-            while next_page_token:
-                params = {}
-                if next_page_token and next_page_token != "###initial":
-                    params["pageToken"] = next_page_token
-                async with session.get(url, headers=headers, params=params) as response:
-                    results = await response.json()
-                    next_page_token = results.get("nextPageToken")
-                    for m in results["publisherModels"]:
-                        name = m["name"]
-                        version_id = m["versionId"]
-                        model_id = f"{name.split('/')[-1]}@{version_id}"
-                        models.append(model_id)
+        session = await get_http_session()
+        next_page_token = "###initial"
+        while next_page_token:
+            params = {}
+            if next_page_token and next_page_token != "###initial":
+                params["pageToken"] = next_page_token
+            async with session.get(url, headers=headers, params=params) as response:
+                results = await response.json(loads=orjson.loads)
+                next_page_token = results.get("nextPageToken")
+                for m in results["publisherModels"]:
+                    name = m["name"]
+                    version_id = m["versionId"]
+                    model_id = f"{name.split('/')[-1]}@{version_id}"
+                    models.append(model_id)
 
         self.cache_models(api_key, self._base_url, models)
         return models
 
+    @classmethod
+    async def _convert_payload(cls, payload: dict[str, Any]) -> dict[str, Any]:
+        """Convert an OpenAI completion payload to a Vertex Anthropic one.
+
+        Conversions of small text-only payloads are cached, so identical repeat
+        requests (retries, benchmarks, deterministic agents) skip the conversion.
+        Payloads with content parts aren't cached or even serialised for the key:
+        image and file parts are what make payloads large, and image URLs are
+        downloaded into the converted payload. Callers get a deep copy, as the
+        converted messages are nested lists that could otherwise be mutated in place.
+        """
+        key = None
+        if VERTEX_PAYLOAD_CACHE_SIZE > 0 and not any(
+            isinstance(message.get("content"), list) for message in payload.get("messages", ())
+        ):
+            try:
+                raw = orjson.dumps(payload, option=orjson.OPT_SORT_KEYS)
+            except TypeError:
+                raw = None
+            if raw is not None and len(raw) <= VERTEX_PAYLOAD_CACHE_MAX_BYTES:
+                key = hashlib.blake2b(raw, digest_size=16).digest()
+                cached = cls._payload_cache.get(key)
+                if cached is not None:
+                    cls._payload_cache.move_to_end(key)
+                    return copy.deepcopy(cached)
+
+        anthropic_payload = await AnthropicAdapter.convert_openai_payload_to_anthropic(payload, allow_url_download=True)
+
+        # vertex specific payload
+        anthropic_payload["anthropic_version"] = "vertex-2023-10-16"
+        del anthropic_payload["model"]
+
+        if key is not None:
+            cls._payload_cache[key] = anthropic_payload
+            if len(cls._payload_cache) > VERTEX_PAYLOAD_CACHE_SIZE:
+                cls._payload_cache.popitem(last=False)
+            return copy.deepcopy(anthropic_payload)
+        return anthropic_payload
+
     async def process_completion(self, endpoint: str, payload: dict[str, Any], api_key: str) -> Any:
         token = await self.vertex_authentication(api_key)
         headers = {
@@ -217,18 +336,14 @@ class VertexAdapter(ProviderAdapter):
 
         streaming = payload.get("stream", False)
         model_name = payload["model"]
-        anthropic_payload = await AnthropicAdapter.convert_openai_payload_to_anthropic(payload, allow_url_download=True)
-
-        # vertex specific payload
-        anthropic_payload["anthropic_version"] = "vertex-2023-10-16"
-        del anthropic_payload["model"]
+        anthropic_payload = await self._convert_payload(payload)
 
         logger.debug(f"Vertex API request - model: {model_name}, streaming: {streaming}, publisher: {self.publisher}, location: {self.location}")
 
         def error_handler(error_text: str, http_status: int):
             logger.error(f"Vertex API error - code: {http_status}, message: {error_text}")
             try:
-                error_json = json.loads(error_text)
+                error_json = orjson.loads(error_text)
                 error_message = error_json.get("error", {}).get("message", "Unknown error")
                 error_code = error_json.get("error", {}).get("code", http_status)
             except Exception:
@@ -238,12 +353,12 @@ class VertexAdapter(ProviderAdapter):
         if streaming:
             # https://cloud.google.com/vertex-ai/docs/reference/rest/v1/projects.locations.endpoints/streamRawPredict
             # vertex doesn't do actual streaming, it just returns a stream of json objects
-            url = f"{self._base_url}/v1/projects/{self.project_id}/locations/{self.location}/publishers/{self.publisher}/models/{model_name}:streamRawPredict"
+            url = f"{self._base_url}/v1/projects/{self.project_id}/{self._models_path}/{model_name}:streamRawPredict"
             logger.debug(f"Vertex streaming URL: {url}")
             # Use the same streaming response handling as Anthropic adapter
             return await AnthropicAdapter.stream_anthropic_response(url, headers, anthropic_payload, model_name, error_handler)
         else:
-            url = f"{self._base_url}/v1/projects/{self.project_id}/locations/{self.location}/publishers/{self.publisher}/models/{model_name}:rawPredict"
+            url = f"{self._base_url}/v1/projects/{self.project_id}/{self._models_path}/{model_name}:rawPredict"
             logger.debug(f"Vertex non-streaming URL: {url}")
             return await AnthropicAdapter.process_regular_response(url, headers, anthropic_payload, model_name, error_handler)
     
@@ -12,6 +12,7 @@ import tiktoken
 
 from app.api.schemas.anthropic import ContentBlockText, ContentBlockToolUse
 from app.core.logger import get_logger
+from app.utils.sse import split_sse_events
 
 logger = get_logger(name="anthropic_streaming")
 
@@ -73,8 +74,8 @@ async def handle_anthropic_streaming_response_from_openai_stream(
         yield f"event: message_start\ndata: {json.dumps(message_start_event_data)}\n\n"
         yield f"event: ping\ndata: {json.dumps({'type': 'ping'})}\n\n"
         
-        # Process the OpenAI stream
-        async for chunk_bytes in openai_stream:
+        # Process the OpenAI stream one SSE event at a time
+        async for chunk_bytes in split_sse_events(openai_stream):
             try:
                 chunk_str = chunk_bytes.decode('utf-8')
                 if chunk_str.strip() == "data: [DONE]":
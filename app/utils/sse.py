@@ -0,0 +1,58 @@
+"""
+Helpers for consuming OpenAI-style Server-Sent Events byte streams.
+
+Provider adapters may emit several complete SSE events in a single chunk, so
+consumers must not assume one ``data:`` line per chunk.
+"""
+
+from collections.abc import AsyncIterator, Iterator
+
+SSE_DATA_PREFIX = b"data:"
+SSE_EVENT_SEPARATOR = b"\n\n"
+# Events may also be framed with CRLF or bare CR line endings
+SSE_EVENT_SEPARATORS = (SSE_EVENT_SEPARATOR, b"\r\n\r\n", b"\r\r")
+
+
+def iter_sse_data(chunk: bytes) -> Iterator[bytes]:
+    """Yield the payload of every ``data:`` line contained in ``chunk``."""
+    for line in chunk.splitlines():
+        if line.startswith(SSE_DATA_PREFIX):
+            data = line[len(SSE_DATA_PREFIX) :].strip()
+            if data:
+                yield data
+
+
+def _last_event_end(buffer: bytearray) -> int:
+    """Offset just past the last complete event in ``buffer``, or 0 if there is none"""
+    end = 0
+    for separator in SSE_EVENT_SEPARATORS:
+        index = buffer.rfind(separator)
+        if index != -1:
+            end = max(end, index + len(separator))
+    return end
+
+
+async def split_sse_events(
+    stream: AsyncIterator[bytes],
+) -> AsyncIterator[bytes]:
+    """Re-frame a stream so that every yielded chunk holds exactly one event."""
+    async for chunk in stream:
+        for data in iter_sse_data(chunk):
+            yield b"data: " + data + b"\n\n"
+
+
+async def iter_sse_events(stream: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    """Re-chunk a raw byte stream so every yielded chunk ends on an event boundary.
+
+    Each chunk holds all the complete events buffered so far, so arbitrarily
+    sized reads (e.g. ``StreamReader.iter_any()``) never split an event.
+    """
+    buffer = bytearray()
+    async for data in stream:
+        buffer += data
+        end = _last_event_end(buffer)
+        if end:
+            yield bytes(buffer[:end])
+            del buffer[:end]
+    if buffer:
+        yield bytes(buffer)
@@ -82,6 +82,30 @@ async def test_basic_async_cache_operations():
     return True
 
 
+async def test_async_cache_max_entries():
+    """Test that a bounded async cache evicts expired, then the oldest entries"""
+    cache = AsyncCache(ttl_seconds=60, max_entries=10)
+
+    await cache.set("expiring_key", "expiring_value", ttl=1)
+    for i in range(10):
+        await cache.set(f"key_{i}", i)
+    assert len(cache.cache) <= 10, "Bounded cache grew past max_entries"
+    assert await cache.get("expiring_key") is None, "Oldest entry was not evicted"
+
+    # Refreshing a key makes it the newest entry
+    await cache.set("key_1", 1)
+    await cache.set("key_10", 10)
+    assert await cache.get("key_1") == 1, "Refreshed entry was evicted"
+    assert len(cache.cache) == len(cache.expiry) <= 10
+
+    # Expired entries are dropped when read
+    await cache.set("short_key", "short_value", ttl=1)
+    await asyncio.sleep(1.1)
+    assert await cache.get("short_key") is None
+    assert "short_key" not in cache.cache and "short_key" not in cache.expiry
+    return True
+
+
 async def test_user_async_cache():
     """Test async user caching functionality"""
     print("\n🔍 TESTING ASYNC USER CACHE")
@@ -0,0 +1,126 @@
+import json
+from unittest import IsolatedAsyncioTestCase as TestCase
+from unittest.mock import AsyncMock, patch
+
+from app.exceptions.exceptions import ProviderAPIException
+from app.services.providers.cohere_adapter import MAX_EMBED_BATCH_SIZE, CohereAdapter
+from tests.unit_tests.utils.helpers import ClientSessionMock
+
+
+def embed_response(count, start=0, tokens=1):
+    return {
+        "embeddings": {"float": [[float(start + i)] for i in range(count)]},
+        "meta": {"billed_units": {"input_tokens": tokens}},
+    }
+
+
+class TestCohereProvider(TestCase):
+    def setUp(self):
+        self.adapter = CohereAdapter(
+            provider_name="test-cohere",
+            base_url="https://api.cohere.com",
+            config=None,
+        )
+        self.api_key = "test-api-key"
+
+    async def test_chat_completion_streaming_split_events(self):
+        events = [
+            {"type": "message-start", "id": "msg-1"},
+            {"type": "content-delta", "delta": {"message": {"content": {"text": "Hello"}}}},
+            {"type": "content-delta", "delta": {"message": {"content": {"text": " world"}}}},
+            {
+                "type": "message-end",
+                "delta": {"finish_reason": "COMPLETE"},
+                "usage": {"billed_units": {"input_tokens": 3, "output_tokens": 2}},
+            },
+        ]
+        raw = "".join(
+            f"event: {event['type']}\ndata: {json.dumps(event)}\n\n" for event in events
+        )
+        # Network reads that split events, and lines, at arbitrary points
+        chunks = [raw[i : i + 13] for i in range(0, len(raw), 13)]
+        payload = {"model": "command-r", "messages": [], "stream": True}
+
+        with patch("aiohttp.ClientSession", ClientSessionMock()) as mock_session:
+            mock_session.responses = [(chunks, 200)]
+
+            stream = await self.adapter.process_completion(
+                endpoint="chat/completions", payload=payload, api_key=self.api_key
+            )
+            output = b"".join([chunk async for chunk in stream]).decode()
+
+        data = [
+            line[len("data: ") :]
+            for line in output.split("\n\n")
+            if line.startswith("data: ")
+        ]
+        self.assertEqual(data[-1], "[DONE]")
+        converted = [json.loads(d) for d in data[:-1]]
+        self.assertEqual(len(converted), len(events))
+        self.assertEqual({c["id"] for c in converted}, {"msg-1"})
+        self.assertEqual(
+            "".join(c["choices"][0]["delta"].get("content", "") for c in converted),
+            "Hello world",
+        )
+        self.assertEqual(converted[-1]["choices"][0]["finish_reason"], "COMPLETE")
+        self.assertEqual(converted[-1]["usage"]["prompt_tokens"], 3)
+
+    async def test_process_embeddings_batches_large_input(self):
+        texts = [f"text {i}" for i in range(2 * MAX_EMBED_BATCH_SIZE + 8)]
+        payload = {"model": "embed-english-v3.0", "input": texts}
+
+        with patch("aiohttp.ClientSession", ClientSessionMock()) as mock_session:
+            mock_session.responses = [
+                (embed_response(MAX_EMBED_BATCH_SIZE, 0, 10), 200),
+                (embed_response(MAX_EMBED_BATCH_SIZE, MAX_EMBED_BATCH_SIZE, 10), 200),
+                (embed_response(8, 2 * MAX_EMBED_BATCH_SIZE, 1), 200),
+            ]
+
+            result = await self.adapter.process_embeddings(
+                endpoint="embeddings", payload=payload, api_key=self.api_key
+            )
+
+        self.assertEqual(
+            [p["texts"] for p in mock_session.posted_json],
+            [
+                texts[:MAX_EMBED_BATCH_SIZE],
+                texts[MAX_EMBED_BATCH_SIZE : 2 * MAX_EMBED_BATCH_SIZE],
+                texts[2 * MAX_EMBED_BATCH_SIZE :],
+            ],
+        )
+        self.assertEqual([d["index"] for d in result["data"]], list(range(len(texts))))
+        self.assertEqual([d["embedding"][0] for d in result["data"]], list(range(len(texts))))
+        self.assertEqual(result["usage"], {"prompt_tokens": 21, "total_tokens": 21})
+
+    async def test_process_embeddings_retries_rate_limit(self):
+        payload = {"model": "embed-english-v3.0", "input": "hello"}
+
+        with (
+            patch("aiohttp.ClientSession", ClientSessionMock()) as mock_session,
+            patch("asyncio.sleep", AsyncMock()) as mock_sleep,
+        ):
+            mock_session.responses = [({"message": "slow down"}, 429), (embed_response(1), 200)]
+
+            result = await self.adapter.process_embeddings(
+                endpoint="embeddings", payload=payload, api_key=self.api_key
+            )
+
+        self.assertEqual(len(mock_session.posted_urls), 2)
+        mock_sleep.assert_awaited_once()
+        self.assertEqual(result["data"][0]["embedding"], [0.0])
+
+    async def test_process_embeddings_batch_failure_raises_provider_error(self):
+        texts = [f"text {i}" for i in range(MAX_EMBED_BATCH_SIZE + 1)]
+        payload = {"model": "embed-english-v3.0", "input": texts}
+
+        with patch("aiohttp.ClientSession", ClientSessionMock()) as mock_session:
+            mock_session.responses = [
+                ({"message": "invalid api token"}, 401),
+                (embed_response(1, MAX_EMBED_BATCH_SIZE), 200),
+            ]
+
+            with self.assertRaises(ProviderAPIException) as ctx:
+                await self.adapter.process_embeddings(
+                    endpoint="embeddings", payload=payload, api_key=self.api_key
+                )
+        self.assertEqual(ctx.exception.error_code, 401)
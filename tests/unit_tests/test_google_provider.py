@@ -1,9 +1,11 @@
+import asyncio
 import json
 import os
 from unittest import IsolatedAsyncioTestCase as TestCase
-from unittest.mock import patch
+from unittest.mock import AsyncMock, patch
 
-from app.services.providers.google_adapter import GoogleAdapter
+from app.exceptions.exceptions import ProviderAPIException
+from app.services.providers.google_adapter import GoogleAdapter, _JsonObjectScanner
 from tests.unit_tests.utils.helpers import (
     ClientSessionMock,
     validate_chat_completion_response,
@@ -137,3 +139,132 @@ class TestGoogleProvider(TestCase):
                     }
                 ],
             }
+
+    async def test_list_models_concurrent_calls_share_fetch(self):
+        with patch("aiohttp.ClientSession", ClientSessionMock()) as mock_session:
+            # Only one response is queued: a second fetch would fail
+            mock_session.responses = [(MOCK_LIST_MODELS_RESPONSE_DATA, 200)]
+
+            results = await asyncio.gather(
+                self.adapter.list_models(api_key="test-api-key-concurrent"),
+                self.adapter.list_models(api_key="test-api-key-concurrent"),
+            )
+            self.assertEqual(results[0], results[1])
+            self.assertEqual(len(mock_session.get_urls), 1)
+
+    def test_json_object_scanner_split_chunks(self):
+        objects = [{"text": 'a "quoted" {brace}'}, {"text": "back\\slash"}, {"n": [{"m": 1}]}]
+        raw = ("[" + ",\r\n".join(json.dumps(o) for o in objects) + "]").encode()
+
+        scanner = _JsonObjectScanner()
+        result = []
+        for i in range(0, len(raw), 7):
+            result.extend(json.loads(bytes(o)) for o in scanner.feed(raw[i : i + 7]))
+        self.assertEqual(result, objects)
+
+    async def test_process_embeddings_batch(self):
+        payload = {"model": "text-embedding-004", "input": ["hello", "world"]}
+        response = {"embeddings": [{"values": [0.1, 0.2]}, {"values": [0.3, 0.4]}]}
+        with patch("aiohttp.ClientSession", ClientSessionMock()) as mock_session:
+            mock_session.responses = [(response, 200)]
+
+            result = await self.adapter.process_embeddings(
+                api_key=self.api_key, payload=payload, endpoint="embeddings"
+            )
+            self.assertEqual(
+                mock_session.posted_urls,
+                [
+                    "https://generativelanguage.googleapis.com/v1beta/models/text-embedding-004:batchEmbedContents"
+                ],
+            )
+            self.assertEqual(
+                mock_session.posted_json[0],
+                {
+                    "requests": [
+                        {"model": "models/text-embedding-004", "content": {"parts": [{"text": "hello"}]}},
+                        {"model": "models/text-embedding-004", "content": {"parts": [{"text": "world"}]}},
+                    ]
+                },
+            )
+            self.assertEqual([d["index"] for d in result["data"]], [0, 1])
+            self.assertEqual(result["data"][1]["embedding"], [0.3, 0.4])
+
+    async def test_process_embeddings_retries_unavailable(self):
+        payload = {"model": "text-embedding-004", "input": "hello"}
+        response = {"embedding": {"values": [0.1, 0.2]}}
+        with (
+            patch("aiohttp.ClientSession", ClientSessionMock()) as mock_session,
+            patch("asyncio.sleep", AsyncMock()) as mock_sleep,
+        ):
+            mock_session.responses = [({}, 503), (response, 200)]
+
+            result = await self.adapter.process_embeddings(
+                api_key=self.api_key, payload=payload, endpoint="embeddings"
+            )
+            self.assertEqual(len(mock_session.posted_urls), 2)
+            mock_sleep.assert_awaited_once()
+            self.assertEqual(result["data"][0]["embedding"], [0.1, 0.2])
+
+    async def test_process_embeddings_does_not_retry_internal_error(self):
+        payload = {"model": "text-embedding-004", "input": "hello"}
+        with (
+            patch("aiohttp.ClientSession", ClientSessionMock()) as mock_session,
+            patch("asyncio.sleep", AsyncMock()) as mock_sleep,
+        ):
+            mock_session.responses = [({"error": "internal"}, 500)]
+
+            with self.assertRaises(ProviderAPIException):
+                await self.adapter.process_embeddings(
+                    api_key=self.api_key, payload=payload, endpoint="embeddings"
+                )
+            # A failed POST may already have done (paid) work, so it isn't resent
+            self.assertEqual(len(mock_session.posted_urls), 1)
+            mock_sleep.assert_not_awaited()
+
+    async def test_cached_embeddings_report_no_usage(self):
+        payload = {"model": "text-embedding-004", "input": "cached input"}
+        response = {"embedding": {"values": [0.1, 0.2]}}
+        with (
+            patch("aiohttp.ClientSession", ClientSessionMock()) as mock_session,
+            patch("app.services.providers.google_adapter.GOOGLE_RESPONSE_CACHE_TTL", 60),
+        ):
+            mock_session.responses = [(response, 200)]
+
+            first = await self.adapter.process_embeddings(
+                api_key=self.api_key, payload=payload, endpoint="embeddings"
+            )
+            second = await self.adapter.process_embeddings(
+                api_key=self.api_key, payload=payload, endpoint="embeddings"
+            )
+            self.assertEqual(len(mock_session.posted_urls), 1)
+            self.assertEqual(second["data"], first["data"])
+            # A cache hit costs no tokens, and mutating it leaves the cache intact
+            self.assertTrue(all(v == 0 for v in second["usage"].values() if isinstance(v, int)))
+            second["data"].clear()
+            third = await self.adapter.process_embeddings(
+                api_key=self.api_key, payload=payload, endpoint="embeddings"
+            )
+            self.assertEqual(third["data"], first["data"])
+
+    async def test_request_slot_times_out_with_503(self):
+        with (
+            patch("aiohttp.ClientSession", ClientSessionMock()) as mock_session,
+            patch("app.services.providers.google_adapter.GOOGLE_SLOT_TIMEOUT", 0.01),
+        ):
+            await GoogleAdapter._get_session()
+            GoogleAdapter._semaphore = asyncio.Semaphore(0)
+            with self.assertRaises(ProviderAPIException) as ctx:
+                await self.adapter._request_json(
+                    "GET", "https://example.com/models", "List Models API"
+                )
+            self.assertEqual(ctx.exception.error_code, 503)
+            self.assertEqual(mock_session.get_urls, [])
+
+    async def test_request_slot_released_once_headers_arrive(self):
+        with patch("aiohttp.ClientSession", ClientSessionMock()) as mock_session:
+            await GoogleAdapter._get_session()
+            GoogleAdapter._semaphore = asyncio.Semaphore(1)
+            mock_session.responses = [(["[]"], 200)]
+            async with GoogleAdapter._request("POST", "https://example.com/stream"):
+                # A slow streamed body doesn't keep other requests waiting
+                self.assertFalse(GoogleAdapter._semaphore.locked())
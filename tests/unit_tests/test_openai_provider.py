@@ -1,9 +1,12 @@
+import asyncio
 import json
 import os
 from unittest import IsolatedAsyncioTestCase as TestCase
-from unittest.mock import patch
+from unittest.mock import AsyncMock, patch
 
-from app.services.providers.openai_adapter import OpenAIAdapter
+from app.exceptions.exceptions import ProviderAPIException
+from app.services.providers.azure_adapter import AzureAdapter
+from app.services.providers.openai_adapter import OpenAIAdapter, _embedding_encoder
 from tests.unit_tests.utils.helpers import (
     ClientSessionMock,
     OPENAAI_STANDARD_CHAT_COMPLETION_RESPONSE,
@@ -159,3 +162,369 @@ class TestOpenAIProvider(TestCase):
 
             # verify that the payload sent to openai has a list as input
             self.assertIsInstance(mock_session.posted_json[0]["input"], list)
+
+    async def test_process_embeddings_multiple_batches(self):
+        # Two long inputs fill the first batch, the third spills into a second
+        payload = {
+            "model": "text-embedding-ada-002",
+            "input": ["a" * 20000, "b" * 20000, "c"],
+        }
+
+        def batch_response(values):
+            return {
+                "object": "list",
+                "data": [
+                    {"object": "embedding", "index": i, "embedding": [v]}
+                    for i, v in enumerate(values)
+                ],
+                "model": "text-embedding-ada-002",
+                "usage": {"prompt_tokens": 2, "total_tokens": 2},
+            }
+
+        with (
+            patch("aiohttp.ClientSession", ClientSessionMock()) as mock_session,
+            # Use the character heuristic so batching doesn't depend on tokenizer files
+            patch(
+                "app.services.providers.openai_adapter._embedding_encoder",
+                return_value=None,
+            ),
+        ):
+            mock_session.responses = [
+                (batch_response([0.1, 0.2]), 200),
+                (batch_response([0.3]), 200),
+            ]
+
+            result = await self.adapter.process_embeddings(
+                api_key=self.api_key, payload=payload, endpoint="embeddings"
+            )
+            self.assertEqual(len(mock_session.posted_json), 2)
+            self.assertEqual([d["index"] for d in result["data"]], [0, 1, 2])
+            self.assertEqual(
+                [d["embedding"] for d in result["data"]], [[0.1], [0.2], [0.3]]
+            )
+            self.assertEqual(result["usage"], {"prompt_tokens": 4, "total_tokens": 4})
+
+    async def test_list_models_cached_and_evicted(self):
+        with (
+            patch("aiohttp.ClientSession", ClientSessionMock()) as mock_session,
+            patch.object(OpenAIAdapter, "_models_cache_max_size", 1),
+        ):
+            mock_session.responses = [
+                (MOCK_LIST_MODELS_RESPONSE_DATA, 200),
+                (MOCK_LIST_MODELS_RESPONSE_DATA, 200),
+                (MOCK_LIST_MODELS_RESPONSE_DATA, 200),
+            ]
+
+            first = await self.adapter.list_models(api_key="cache-key-1")
+            self.assertEqual(await self.adapter.list_models(api_key="cache-key-1"), first)
+            self.assertEqual(len(mock_session.get_urls), 1)
+
+            # A second key evicts the first from the size-bounded cache
+            await self.adapter.list_models(api_key="cache-key-2")
+            await self.adapter.list_models(api_key="cache-key-1")
+            self.assertEqual(len(mock_session.get_urls), 3)
+
+    async def test_list_models_serves_stale_on_error(self):
+        with (
+            patch("aiohttp.ClientSession", ClientSessionMock()) as mock_session,
+            patch.object(OpenAIAdapter, "_models_cache_ttl", -1),
+        ):
+            mock_session.responses = [
+                (MOCK_LIST_MODELS_RESPONSE_DATA, 200),
+                ({"error": "unavailable"}, 503),
+            ]
+
+            first = await self.adapter.list_models(api_key="stale-key")
+            # The entry is already expired, so the second call hits the failing API
+            self.assertEqual(await self.adapter.list_models(api_key="stale-key"), first)
+            self.assertEqual(len(mock_session.get_urls), 2)
+
+    async def test_list_models_raises_auth_errors_despite_stale(self):
+        with (
+            patch("aiohttp.ClientSession", ClientSessionMock()) as mock_session,
+            patch.object(OpenAIAdapter, "_models_cache_ttl", -1),
+        ):
+            mock_session.responses = [
+                (MOCK_LIST_MODELS_RESPONSE_DATA, 200),
+                ({"error": "invalid api key"}, 401),
+            ]
+
+            await self.adapter.list_models(api_key="revoked-key")
+            with self.assertRaises(ProviderAPIException) as ctx:
+                await self.adapter.list_models(api_key="revoked-key")
+            self.assertEqual(ctx.exception.error_code, 401)
+
+    def test_azure_process_streaming_chunk_multiple_events(self):
+        chunk = (
+            b'data: {"id": "1", "choices": []}\n\n'
+            b'data: {"id": "2", "choices": [{"index": 0, "delta": {"content": "hi"}}]}\n\n'
+            b"data: [DONE]\n\n"
+        )
+        events = [
+            line[len(b"data: "):]
+            for line in AzureAdapter.process_streaming_chunk(chunk).split(b"\n")
+            if line
+        ]
+        self.assertEqual(json.loads(events[0])["choices"], [{"index": 0, "delta": {}}])
+        self.assertEqual(json.loads(events[1])["choices"][0]["delta"], {"content": "hi"})
+        self.assertEqual(events[2], b"[DONE]")
+
+    async def test_list_models_concurrent_calls_share_fetch(self):
+        with patch("aiohttp.ClientSession", ClientSessionMock()) as mock_session:
+            mock_session.responses = [(MOCK_LIST_MODELS_RESPONSE_DATA, 200)]
+
+            first, second = await asyncio.gather(
+                self.adapter.list_models(api_key="shared-fetch-key"),
+                self.adapter.list_models(api_key="shared-fetch-key"),
+            )
+            self.assertEqual(first, second)
+            self.assertEqual(len(mock_session.get_urls), 1)
+
+    def test_create_token_aware_batches_first_fit_decreasing(self):
+        # Arrival-order packing would need three batches here
+        batches = self.adapter._create_token_aware_batches([3000, 6000, 2000, 5000])
+        self.assertEqual(batches, [[1, 2], [0, 3]])
+
+    def test_embedding_encoder_failure_is_not_cached(self):
+        encoder = object()
+        with patch(
+            "tiktoken.encoding_for_model", side_effect=[OSError("offline"), encoder]
+        ):
+            self.assertIsNone(_embedding_encoder("flaky-embedding-model"))
+            # The next request retries the load instead of reusing the failure
+            self.assertIs(_embedding_encoder("flaky-embedding-model"), encoder)
+            self.assertIs(_embedding_encoder("flaky-embedding-model"), encoder)
+
+    async def test_process_embeddings_retries_and_adapts_batch_limit(self):
+        payload = {"model": "text-embedding-ada-002", "input": ["hello"]}
+        limits = OpenAIAdapter._embedding_batch_limits
+        self.addCleanup(limits.clear)
+        response = {
+            "object": "list",
+            "data": [{"object": "embedding", "index": 0, "embedding": [0.1]}],
+            "model": "text-embedding-ada-002",
+            "usage": {"prompt_tokens": 1, "total_tokens": 1},
+        }
+
+        with (
+            patch("aiohttp.ClientSession", ClientSessionMock()) as mock_session,
+            patch("asyncio.sleep", new=AsyncMock()) as mock_sleep,
+        ):
+            mock_session.responses = [({"error": "rate limited"}, 429), (response, 200)]
+            result = await self.adapter.process_embeddings(
+                api_key=self.api_key, payload=payload, endpoint="embeddings"
+            )
+            self.assertEqual(len(mock_session.posted_json), 2)
+            mock_sleep.assert_awaited_once()
+            self.assertEqual(result["data"][0]["embedding"], [0.1])
+            # Halved by the 429, then grown back by the successful retry
+            key = f"{self.adapter.provider_name}:text-embedding-ada-002"
+            self.assertEqual(limits[key], 4096 + 128)
+
+            # Non-transient errors are not retried
+            mock_session.responses = [({"error": "bad key"}, 401)]
+            with self.assertRaises(ProviderAPIException):
+                await self.adapter.process_embeddings(
+                    api_key=self.api_key, payload=payload, endpoint="embeddings"
+                )
+            self.assertEqual(len(mock_session.posted_json), 3)
+
+    async def test_process_embeddings_splits_batch_over_context_length(self):
+        payload = {"model": "text-embedding-ada-002", "input": ["a", "b"]}
+
+        def single(value):
+            return {
+                "object": "list",
+                "data": [{"object": "embedding", "index": 0, "embedding": [value]}],
+                "model": "text-embedding-ada-002",
+                "usage": {"prompt_tokens": 1, "total_tokens": 1},
+            }
+
+        with patch("aiohttp.ClientSession", ClientSessionMock()) as mock_session:
+            mock_session.responses = [
+                ({"error": "This model's maximum context length is 8192 tokens"}, 400),
+                (single(0.1), 200),
+                (single(0.2), 200),
+            ]
+            result = await self.adapter.process_embeddings(
+                api_key=self.api_key, payload=payload, endpoint="embeddings"
+            )
+            self.assertEqual(
+                [p["input"] for p in mock_session.posted_json], [["a", "b"], ["a"], ["b"]]
+            )
+            self.assertEqual([d["embedding"] for d in result["data"]], [[0.1], [0.2]])
+            self.assertEqual(result["usage"], {"prompt_tokens": 2, "total_tokens": 2})
+
+    async def test_process_embeddings_pre_tokenized_input(self):
+        payload = {"model": "text-embedding-ada-002", "input": [1, 2, 3]}
+        response = {
+            "object": "list",
+            "data": [{"object": "embedding", "index": 0, "embedding": [0.1]}],
+            "model": "text-embedding-ada-002",
+            "usage": {"prompt_tokens": 3, "total_tokens": 3},
+        }
+        with (
+            patch("aiohttp.ClientSession", ClientSessionMock()) as mock_session,
+            patch("app.services.providers.openai_adapter._embedding_encoder") as mock_encoder,
+        ):
+            mock_session.responses = [(response, 200)]
+
+            result = await self.adapter.process_embeddings(
+                api_key=self.api_key, payload=payload, endpoint="embeddings"
+            )
+            # A flat list of token ids is one input and needs no tokenizer
+            self.assertEqual(mock_session.posted_json[0]["input"], [[1, 2, 3]])
+            mock_encoder.assert_not_called()
+            self.assertEqual(len(result["data"]), 1)
+
+    async def test_process_embeddings_deduplicates_inputs(self):
+        payload = {"model": "text-embedding-ada-002", "input": ["a", "b", "a"]}
+        response = {
+            "object": "list",
+            "data": [
+                {"object": "embedding", "index": 0, "embedding": [0.1]},
+                {"object": "embedding", "index": 1, "embedding": [0.2]},
+            ],
+            "model": "text-embedding-ada-002",
+            "usage": {"prompt_tokens": 2, "total_tokens": 2},
+        }
+        with patch("aiohttp.ClientSession", ClientSessionMock()) as mock_session:
+            mock_session.responses = [(response, 200)]
+
+            result = await self.adapter.process_embeddings(
+                api_key=self.api_key, payload=payload, endpoint="embeddings"
+            )
+            self.assertEqual(mock_session.posted_json[0]["input"], ["a", "b"])
+            self.assertEqual([d["index"] for d in result["data"]], [0, 1, 2])
+            self.assertEqual(
+                [d["embedding"] for d in result["data"]], [[0.1], [0.2], [0.1]]
+            )
+
+    async def test_process_embeddings_concurrent_requests_share_inputs(self):
+        def response(values):
+            return {
+                "object": "list",
+                "data": [
+                    {"object": "embedding", "index": i, "embedding": [v]}
+                    for i, v in enumerate(values)
+                ],
+                "model": "text-embedding-ada-002",
+                "usage": {"prompt_tokens": len(values), "total_tokens": len(values)},
+            }
+
+        async def run_inline(func, *args):
+            return func(*args)
+
+        # Load the tokenizer inline, so the requests post in a fixed order
+        with (
+            patch("aiohttp.ClientSession", ClientSessionMock()) as mock_session,
+            patch("asyncio.to_thread", run_inline),
+        ):
+            mock_session.responses = [(response([0.1, 0.2]), 200), (response([0.3]), 200)]
+
+            first, second = await asyncio.gather(
+                self.adapter.process_embeddings(
+                    api_key=self.api_key,
+                    payload={"model": "text-embedding-ada-002", "input": ["a", "b"]},
+                    endpoint="embeddings",
+                ),
+                self.adapter.process_embeddings(
+                    api_key=self.api_key,
+                    payload={"model": "text-embedding-ada-002", "input": ["b", "c"]},
+                    endpoint="embeddings",
+                ),
+            )
+            # "b" is only sent upstream by the first request
+            self.assertEqual(
+                [p["input"] for p in mock_session.posted_json], [["a", "b"], ["c"]]
+            )
+            self.assertEqual([d["embedding"] for d in first["data"]], [[0.1], [0.2]])
+            self.assertEqual([d["embedding"] for d in second["data"]], [[0.2], [0.3]])
+            self.assertEqual(OpenAIAdapter._embedding_fetches, {})
+
+    async def test_process_embeddings_waiter_reembeds_cancelled_inputs(self):
+        blocked = asyncio.Event()
+        calls = []
+
+        async def embed_inputs(inputs, *args):
+            calls.append(inputs)
+            if len(calls) == 1:
+                blocked.set()
+                await asyncio.Event().wait()
+            items = [{"object": "embedding", "index": 0, "embedding": [ord(v)]} for v in inputs]
+            return items, {"prompt_tokens": len(inputs), "total_tokens": len(inputs)}, None
+
+        with patch.object(self.adapter, "_embed_inputs", embed_inputs):
+            owner = asyncio.create_task(
+                self.adapter.process_embeddings(
+                    api_key=self.api_key,
+                    payload={"model": "text-embedding-ada-002", "input": ["a", "b"]},
+                    endpoint="embeddings",
+                )
+            )
+            await blocked.wait()
+            waiter = asyncio.create_task(
+                self.adapter.process_embeddings(
+                    api_key=self.api_key,
+                    payload={"model": "text-embedding-ada-002", "input": ["b", "c"]},
+                    endpoint="embeddings",
+                )
+            )
+            while len(calls) < 2:
+                await asyncio.sleep(0)
+            owner.cancel()
+
+            # The waiter embeds "b" itself instead of failing with the owner
+            result = await waiter
+            self.assertEqual(calls, [["a", "b"], ["c"], ["b"]])
+            self.assertEqual([d["embedding"] for d in result["data"]], [[ord("b")], [ord("c")]])
+            self.assertEqual(result["usage"], {"prompt_tokens": 2, "total_tokens": 2})
+            self.assertEqual(OpenAIAdapter._embedding_fetches, {})
+
+    async def test_process_embeddings_cache(self):
+        def response(values):
+            return {
+                "object": "list",
+                "data": [
+                    {"object": "embedding", "index": i, "embedding": [v]}
+                    for i, v in enumerate(values)
+                ],
+                "model": "text-embedding-ada-002",
+                "usage": {"prompt_tokens": 1, "total_tokens": 1},
+            }
+
+        with (
+            patch("aiohttp.ClientSession", ClientSessionMock()) as mock_session,
+            patch("app.services.providers.openai_adapter.OPENAI_EMBEDDING_CACHE_TTL", 60),
+        ):
+            mock_session.responses = [(response([0.1]), 200), (response([0.2]), 200)]
+
+            await self.adapter.process_embeddings(
+                api_key="embedding-cache-key",
+                payload={"model": "text-embedding-ada-002", "input": ["cached"]},
+                endpoint="embeddings",
+            )
+            result = await self.adapter.process_embeddings(
+                api_key="embedding-cache-key",
+                payload={"model": "text-embedding-ada-002", "input": ["new", "cached"]},
+                endpoint="embeddings",
+            )
+            # Only the uncached input is sent upstream
+            self.assertEqual(mock_session.posted_json[1]["input"], ["new"])
+            self.assertEqual([d["embedding"] for d in result["data"]], [[0.2], [0.1]])
+            self.assertEqual([d["index"] for d in result["data"]], [0, 1])
+
+    async def test_request_slot_times_out_with_503(self):
+        with (
+            patch("aiohttp.ClientSession", ClientSessionMock()),
+            patch("app.services.providers.openai_adapter.OPENAI_SLOT_TIMEOUT", 0.01),
+        ):
+            await self.adapter._get_session()
+            # Every adapter-wide slot is taken
+            OpenAIAdapter._semaphore = asyncio.Semaphore(0)
+            with self.assertRaises(ProviderAPIException) as ctx:
+                async with self.adapter._request_slot(self.api_key):
+                    pass
+        self.assertEqual(ctx.exception.error_code, 503)
+        # The per-key slots taken first are handed back and dropped
+        self.assertEqual(OpenAIAdapter._key_slots, {})
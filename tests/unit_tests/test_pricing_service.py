@@ -0,0 +1,55 @@
+from decimal import Decimal
+from unittest import IsolatedAsyncioTestCase as TestCase
+from unittest.mock import AsyncMock, patch
+
+from app.services.pricing_service import PricingService
+
+PRICING = {
+    "input_price": Decimal("0.001"),
+    "output_price": Decimal("0.002"),
+    "cached_price": Decimal("0.0005"),
+    "currency": "USD",
+    "source": "exact_match",
+}
+
+
+class TestPricingService(TestCase):
+    def setUp(self):
+        PricingService._pricing_l1_cache.clear()
+        self.addCleanup(PricingService._pricing_l1_cache.clear)
+
+    async def test_calculate_usage_cost_uses_l1_cache(self):
+        with (
+            patch(
+                "app.services.pricing_service.async_provider_service_cache.get",
+                new=AsyncMock(return_value=PRICING),
+            ) as mock_get,
+            patch.object(
+                PricingService, "_fetch_pricing_with_smart_caching", new=AsyncMock()
+            ) as mock_fetch,
+        ):
+            first = await PricingService.calculate_usage_cost(
+                None, "openai", "gpt-4o", prompt_tokens=1000, completion_tokens=1000
+            )
+            second = await PricingService.calculate_usage_cost(
+                None, "openai", "gpt-4o", prompt_tokens=2000, completion_tokens=0
+            )
+
+        # Only the first lookup reaches the shared cache
+        self.assertEqual(mock_get.await_count, 1)
+        mock_fetch.assert_not_awaited()
+        self.assertEqual(first["total_cost"], Decimal("0.003"))
+        self.assertEqual(second["total_cost"], Decimal("0.002"))
+
+    async def test_invalidate_pricing_cache_clears_l1(self):
+        with patch(
+            "app.services.pricing_service.async_provider_service_cache.get",
+            new=AsyncMock(return_value=PRICING),
+        ):
+            await PricingService.calculate_usage_cost(None, "openai", "gpt-4o")
+        with patch(
+            "app.services.pricing_service.async_provider_service_cache.delete",
+            new=AsyncMock(),
+        ):
+            await PricingService.invalidate_pricing_cache("openai", "gpt-4o")
+        self.assertEqual(PricingService._pricing_l1_cache, {})
@@ -404,7 +404,7 @@ class TestProviderService(TestCase):
         mock_response.status = 200
 
         # Create a mock coroutine for json() method
-        async def mock_json():
+        async def mock_json(**_):
             return {"id": "test-id", "object": "chat.completion"}
 
         mock_response.json = mock_json
@@ -209,7 +209,7 @@ class TestProviderServiceImages(TestCase):
         mock_response.status = 200
 
         # Create a mock coroutine for json() method
-        async def mock_json():
+        async def mock_json(**_):
             return {"id": "openai-response", "object": "image_generation"}
 
         mock_response.json = mock_json
@@ -231,7 +231,7 @@ class TestProviderServiceImages(TestCase):
         args, kwargs = mock_post.call_args
         self.assertEqual(kwargs["headers"]["Authorization"], "Bearer test-api-key")
         self.assertEqual(kwargs["json"]["model"], "dall-e-2")
-        self.assertEqual(args[0], "https://api.openai.com/v1/images/generations")
+        self.assertEqual(str(args[0]), "https://api.openai.com/v1/images/generations")
 
     @patch("aiohttp.ClientSession.post")
     async def test_call_openai_process_image_edits(self, mock_post):
@@ -245,7 +245,7 @@ class TestProviderServiceImages(TestCase):
         mock_response.status = 200
 
         # Create a mock coroutine for json() method
-        async def mock_json():
+        async def mock_json(**_):
             return {"id": "openai-response", "object": "image_edits"}
 
         mock_response.json = mock_json
@@ -267,4 +267,4 @@ class TestProviderServiceImages(TestCase):
         args, kwargs = mock_post.call_args
         self.assertEqual(kwargs["headers"]["Authorization"], "Bearer test-api-key")
         self.assertEqual(kwargs["json"]["model"], "dall-e-2")
-        self.assertEqual(args[0], "https://api.openai.com/v1/images/edits")
+        self.assertEqual(str(args[0]), "https://api.openai.com/v1/images/edits")
@@ -0,0 +1,53 @@
+from unittest import IsolatedAsyncioTestCase as TestCase
+
+from app.utils.sse import iter_sse_data, iter_sse_events, split_sse_events
+
+
+async def _stream(chunks):
+    for chunk in chunks:
+        yield chunk
+
+
+class TestSSE(TestCase):
+    def test_iter_sse_data_multiple_events(self):
+        chunk = b'data: {"a": 1}\n\ndata: {"b": 2}\n\ndata: [DONE]\n\n'
+        self.assertEqual(
+            list(iter_sse_data(chunk)), [b'{"a": 1}', b'{"b": 2}', b"[DONE]"]
+        )
+
+    def test_iter_sse_data_ignores_other_fields(self):
+        chunk = b'event: message\ndata: {"a": 1}\n\n: keep-alive\n\n'
+        self.assertEqual(list(iter_sse_data(chunk)), [b'{"a": 1}'])
+
+    async def test_split_sse_events(self):
+        chunks = [b'data: {"a": 1}\n\ndata: {"b": 2}\n\n', b"data: [DONE]\n\n"]
+        result = [c async for c in split_sse_events(_stream(chunks))]
+        self.assertEqual(
+            result,
+            [b'data: {"a": 1}\n\n', b'data: {"b": 2}\n\n', b"data: [DONE]\n\n"],
+        )
+
+    async def test_iter_sse_events_rejoins_split_events(self):
+        chunks = [b'data: {"a"', b': 1}\n\ndata: {"b": 2}\n', b"\ndata: [DONE]\n\n"]
+        result = [c async for c in iter_sse_events(_stream(chunks))]
+        self.assertEqual(
+            result, [b'data: {"a": 1}\n\n', b'data: {"b": 2}\n\ndata: [DONE]\n\n']
+        )
+
+    async def test_iter_sse_events_crlf_framing(self):
+        chunks = [b'data: {"a": 1}\r\n\r\ndata: {"b"', b': 2}\r\n\r\n']
+        result = [c async for c in iter_sse_events(_stream(chunks))]
+        self.assertEqual(result, [b'data: {"a": 1}\r\n\r\n', b'data: {"b": 2}\r\n\r\n'])
+        self.assertEqual(list(iter_sse_data(result[0])), [b'{"a": 1}'])
+
+    async def test_iter_sse_events_cr_framing(self):
+        chunks = [b'data: {"a": 1}\r\rdata: {"b"', b": 2}\r\r"]
+        result = [c async for c in iter_sse_events(_stream(chunks))]
+        self.assertEqual(result, [b'data: {"a": 1}\r\r', b'data: {"b": 2}\r\r'])
+
+    def test_iter_sse_data_after_comment(self):
+        # e.g. OpenRouter sends keep-alive comments ahead of the usage event
+        chunk = b': OPENROUTER PROCESSING\n\ndata: {"usage": {"prompt_tokens": 3}}\n\n'
+        self.assertEqual(
+            list(iter_sse_data(chunk)), [b'{"usage": {"prompt_tokens": 3}}']
+        )
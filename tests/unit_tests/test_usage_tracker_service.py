@@ -0,0 +1,118 @@
+from contextlib import asynccontextmanager
+from decimal import Decimal
+from unittest import IsolatedAsyncioTestCase as TestCase
+from unittest.mock import AsyncMock, patch
+from uuid import uuid4
+
+from app.services.providers.usage_tracker_service import (
+    UsageTrackerService,
+    WalletCharge,
+)
+
+
+@asynccontextmanager
+async def _db_session():
+    yield object()
+
+
+class TestUsageTrackerService(TestCase):
+    async def test_queued_writes_are_applied_in_order(self):
+        calls = []
+
+        async def insert(db, rows):
+            calls.append(("insert", [row["id"] for row in rows]))
+
+        async def update(db, **values):
+            calls.append(("update", values["usage_tracker_id"]))
+
+        with (
+            patch(
+                "app.services.providers.usage_tracker_service.get_db_session",
+                _db_session,
+            ),
+            patch.object(UsageTrackerService, "_insert_usage_trackers", new=insert),
+            patch.object(UsageTrackerService, "update_usage_tracker", new=update),
+            patch.object(
+                UsageTrackerService, "delete_usage_tracker_record", new=AsyncMock()
+            ),
+        ):
+            first = await UsageTrackerService.queue_start_tracking_usage(1, 2, 3, "gpt-4o", "chat/completions")
+            second = await UsageTrackerService.queue_start_tracking_usage(1, 2, 3, "gpt-4o", "chat/completions")
+            await UsageTrackerService.queue_update_usage_tracker(first, 10, 5, 0, 0, "openai", "gpt-4o")
+            await UsageTrackerService.queue_start_tracking_usage(1, 2, 3, "gpt-4o", "embeddings")
+            await UsageTrackerService.flush()
+
+        # Consecutive inserts share one statement, and updates follow their insert
+        self.assertEqual(calls[0], ("insert", [first, second]))
+        self.assertEqual(calls[1], ("update", first))
+        self.assertEqual(calls[2][0], "insert")
+        self.assertIsNone(UsageTrackerService._writer_task)
+
+    async def test_queued_wallet_charges_are_summed_per_user(self):
+        charged = []
+
+        async def update(db, **values):
+            return WalletCharge(7, "chat/completions", "USD", Decimal("0.25"))
+
+        async def charge_wallet(db, charge):
+            charged.append(charge)
+
+        with (
+            patch(
+                "app.services.providers.usage_tracker_service.get_db_session",
+                _db_session,
+            ),
+            patch.object(UsageTrackerService, "update_usage_tracker", new=update),
+            patch.object(UsageTrackerService, "_charge_wallet", new=charge_wallet),
+        ):
+            for _ in range(3):
+                await UsageTrackerService.queue_update_usage_tracker(uuid4(), 10, 5, 0, 0)
+            await UsageTrackerService.flush()
+
+        self.assertEqual(
+            charged, [WalletCharge(7, "chat/completions", "USD", Decimal("0.75"))]
+        )
+
+    async def test_failed_batch_insert_falls_back_to_single_rows(self):
+        inserted = []
+
+        class Session:
+            async def execute(self, statement, rows):
+                if len(rows) > 1 or rows[0]["id"] == "bad":
+                    raise ValueError("insert failed")
+                inserted.append(rows[0]["id"])
+
+            async def commit(self):
+                pass
+
+            async def rollback(self):
+                pass
+
+        rows = [{"id": "first"}, {"id": "bad"}, {"id": "third"}]
+        await UsageTrackerService._insert_usage_trackers(Session(), rows)
+
+        self.assertEqual(inserted, ["first", "third"])
+
+    async def test_full_queue_writes_usage_in_the_request(self):
+        direct = []
+
+        async def write_usage(operation, values):
+            direct.append(operation)
+
+        with (
+            patch(
+                "app.services.providers.usage_tracker_service.get_db_session",
+                _db_session,
+            ),
+            patch(
+                "app.services.providers.usage_tracker_service.USAGE_WRITE_QUEUE_SIZE", 1
+            ),
+            patch.object(UsageTrackerService, "_insert_usage_trackers", new=AsyncMock()),
+            patch.object(UsageTrackerService, "_write_usage", new=write_usage),
+        ):
+            await UsageTrackerService.queue_start_tracking_usage(1, 2, 3, "gpt-4o", "chat/completions")
+            # The queue is full, so this one is written by the caller
+            await UsageTrackerService.queue_update_usage_tracker(uuid4(), 10, 5, 0, 0)
+            await UsageTrackerService.flush()
+
+        self.assertEqual(direct, ["update"])
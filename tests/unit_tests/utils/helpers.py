@@ -18,6 +18,14 @@ class AsyncIterator:
         self.index += 1
         return chunk.encode("utf-8")
 
+    def iter_any(self):
+        """Async iterator of raw bytes as used for streaming"""
+        return self._iter_any_async()
+
+    async def _iter_any_async(self):
+        async for data, _ in self._iter_chunks_async():
+            yield data
+
     def iter_chunks(self, chunk_size=1024):
         """Method expected by Google adapter for streaming"""
         return self._iter_chunks_async(chunk_size)
@@ -53,18 +61,23 @@ class ClientResponse:
     async def __aexit__(self, exc_type, exc_value, traceback):
         pass
 
-    async def json(self):
+    async def json(self, **_):
         return self.json_data
 
     async def read(self):
         return json.dumps(self.json_data).encode("utf-8")
 
+    async def text(self):
+        return json.dumps(self.json_data)
+
     def raise_for_status(self):
         if self.status >= 400:
             raise ClientResponseError(Mock(), Mock(), status=self.status)
 
 
 class ClientSessionMock:
+    closed = False
+
     def __init__(self, responses=None, *_, **__):
         self.responses = responses or []
         self.posted_json = []
@@ -80,13 +93,19 @@ class ClientSessionMock:
     async def __aexit__(self, exc_type, exc_value, traceback):
         pass
 
+    async def close(self):
+        pass
+
+    def request(self, method, url, *args, **kwargs):
+        return getattr(self, method.lower())(url, *args, **kwargs)
+
     def get(self, url, *args, **kwargs):
-        self.get_urls.append(url)
+        self.get_urls.append(str(url))
         j, status = self.responses.pop(0)
         return ClientResponse(j, status)
 
     def post(self, url, *args, **kwargs):
-        self.posted_urls.append(url)
+        self.posted_urls.append(str(url))
         self.posted_json.append(kwargs.get("json", kwargs.get("data")))
         j, status = self.responses.pop(0)
         return ClientResponse(j, status)